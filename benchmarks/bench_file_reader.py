@@ -0,0 +1,49 @@
+﻿import argparse
+import os.path
+import tempfile
+import time
+
+from benchmarks.bench_transcript_parse import create_block
+from src.kaldi_training_data_formatter import ReaderBackend, TranscriptReader
+
+
+def time_backend(path: str, backend: ReaderBackend) -> float:
+    start: float = time.perf_counter()
+
+    with TranscriptReader(path, backend) as reader:
+        for _ in reader:
+            pass
+
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Compare the stream and memory-mapped transcript reader backends.')
+    parser.add_argument('-n',
+                        '--lines',
+                        type=int,
+                        default=1_000_000,
+                        help='The number of synthetic transcript lines to read.')
+    parser.add_argument('--path',
+                        type=str,
+                        help='Read this transcript instead of a synthetic one, e.g. on a network file system.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = args.path
+
+        if path is None:
+            path = os.path.join(directory, 'bench.trans.txt')
+
+            with open(path, mode='w', encoding='utf-8') as f:
+                f.write(create_block(args.lines))
+
+        for backend in ReaderBackend:
+            elapsed: float = time_backend(path, backend)
+            print(f'{backend.name:>6}: {elapsed:8.3f} s')
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
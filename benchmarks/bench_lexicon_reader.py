@@ -0,0 +1,96 @@
+﻿import argparse
+import os.path
+import random
+import tempfile
+import time
+from collections.abc import Mapping
+from typing import Callable
+
+from benchmarks.corpus_generator import PHONES
+from src.kaldi_training_data_formatter import LexiconReader, PhoneLexicon
+
+
+def write_lexicon(path: str, entries: int, seed: int = 0) -> None:
+    rng: random.Random = random.Random(seed)
+    letters: str = 'abcdefghijklmnopqrstuvwxyz'
+
+    with open(path, mode='w', encoding='utf-8') as f:
+        for i in range(entries):
+            word: str = ''.join(rng.choices(letters, k=rng.randint(2, 10))) + str(i)
+            phones: str = ' '.join(rng.choices(PHONES, k=rng.randint(2, 8)))
+            f.write(f'{word.upper()}\t{phones}\n')
+
+
+def read_lexicon_legacy(path: str) -> dict[str, set[str]]:
+    # Per-line tokenization used by LexiconCompiler before LexiconReader
+    write_lexicon: dict[str, set[str]] = {}
+
+    with open(path, mode='r', encoding='utf-8-sig') as f:
+        while line := f.readline():
+            elements: list[str] = [
+                el
+                for el in [token.strip('\n\r ') for token in line.replace('\t', ' ').split(' ')]
+                if len(el) > 0
+            ]
+
+            if len(elements) < 2:
+                continue
+
+            word: str = elements[0].lower()
+            phones: str = ' '.join(elements[1:]).upper()
+            existing_phones: set[str]
+
+            if word in write_lexicon:
+                existing_phones = write_lexicon[word]
+            else:
+                existing_phones = set()
+                write_lexicon[word] = existing_phones
+
+            existing_phones.add(phones)
+
+    return write_lexicon
+
+
+def read_lexicon_streaming(path: str) -> PhoneLexicon:
+    write_lexicon: PhoneLexicon = PhoneLexicon()
+
+    with LexiconReader(path) as reader:
+        reader.read_lexicon(write_lexicon)
+
+    return write_lexicon
+
+
+def measure(name: str, read: Callable[[str], Mapping[str, set[str]]], path: str, entries: int) -> Mapping[str, set[str]]:
+    start: float = time.perf_counter()
+    lexicon: Mapping[str, set[str]] = read(path)
+    elapsed: float = time.perf_counter() - start
+    print(f'{name:>10}: {elapsed:8.3f} s {entries / elapsed:14,.0f} entries/s')
+
+    return lexicon
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Compare lexicon import throughput.')
+    parser.add_argument('-n',
+                        '--entries',
+                        type=int,
+                        default=3_000_000,
+                        help='The number of synthetic lexicon entries to generate.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'lexicon.txt')
+        write_lexicon(path, args.entries)
+
+        expected: Mapping[str, set[str]] = measure('legacy', read_lexicon_legacy, path, args.entries)
+        actual: Mapping[str, set[str]] = measure('streaming', read_lexicon_streaming, path, args.entries)
+
+        if expected != dict(actual):
+            print('Streaming reader produced a different lexicon')
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
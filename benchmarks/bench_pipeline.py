@@ -0,0 +1,104 @@
+﻿import argparse
+import json
+import os.path
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Callable
+
+from benchmarks.corpus_generator import CorpusStats, IMPORT_LEXICON_FILENAME, add_arguments, generate_from_args
+from src.kaldi_training_data_formatter import CorpusIndex, FilesUtil, LexiconCompiler, VocabCompiler
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def get_peak_rss() -> int | None:
+    if resource is None:
+        return None
+
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes while macOS reports bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def time_stage(results: list[dict[str, Any]],
+               name: str,
+               stage: Callable[[], Any],
+               files: int | Callable[[], int],
+               lines: int | Callable[[], int]) -> None:
+    start: float = time.perf_counter()
+    stage()
+    elapsed: float = max(time.perf_counter() - start, 1e-9)
+
+    # Counts that are only known once the stage has run are passed as callables
+    files = files() if callable(files) else files
+    lines = lines() if callable(lines) else lines
+
+    results.append({
+        'stage': name,
+        'seconds': elapsed,
+        'files_per_second': files / elapsed,
+        'lines_per_second': lines / elapsed,
+        'peak_rss_bytes': get_peak_rss(),
+    })
+    print(f'{name:>16}: {elapsed:8.3f} s {files / elapsed:12,.0f} files/s {lines / elapsed:14,.0f} lines/s')
+
+
+def run_pipeline(root: str, stats: CorpusStats, jobs: int) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    index: CorpusIndex = CorpusIndex(root)
+    vocab_compiler: VocabCompiler = VocabCompiler.from_root(root, jobs)
+    lexicon_compiler: LexiconCompiler = LexiconCompiler.from_root(root, True, import_name=IMPORT_LEXICON_FILENAME)
+
+    # Mirrors the stages of App.run
+    time_stage(results, 'scan', index.scan, stats.transcripts, stats.lines)
+    # Only the first transcript of each project is read, so count what the compiler actually read
+    time_stage(results, 'read_vocabulary', lambda: vocab_compiler.read_vocabulary(index),
+               lambda: vocab_compiler.transcripts_read, lambda: vocab_compiler.lines_read)
+    time_stage(results, 'save_vocabulary', vocab_compiler.save_vocabulary, 1, len(vocab_compiler.vocabulary))
+    time_stage(results, 'compile_lexicon', lambda: lexicon_compiler.compile_lexicon(vocab_compiler.vocabulary),
+               1, stats.lexicon_entries)
+    time_stage(results, 'save_lexicon', lexicon_compiler.save_lexicon, 1, len(lexicon_compiler.lexicon))
+    time_stage(results, 'format_audio', lambda: FilesUtil.format_audio_files(os.path.join(root, 'audio'), index, jobs),
+               stats.audio_files, stats.lines)
+
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Time each stage of the pipeline on a synthetic corpus.')
+    add_arguments(parser)
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='The number of parallel workers.')
+    parser.add_argument('-o', '--output', type=str, help='The filename to write the results to as JSON.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        stats: CorpusStats = generate_from_args(root, args)
+        print(f'Generated {stats.transcripts} transcripts with {stats.lines} lines and {stats.words} words')
+
+        results: list[dict[str, Any]] = run_pipeline(root, stats, args.jobs)
+
+    if args.output:
+        report: dict[str, Any] = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'jobs': args.jobs,
+            'corpus': {key: value for key, value in stats.to_dict().items() if key != 'root'},
+            'stages': results,
+            'total_seconds': sum(result['seconds'] for result in results),
+            'peak_rss_bytes': get_peak_rss(),
+        }
+
+        with open(args.output, mode='w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+﻿import argparse
+import os.path
+import subprocess
+import sys
+import time
+
+PACKAGE: str = 'src.kaldi_training_data_formatter'
+
+
+def run_import_time(statement: str, cwd: str) -> dict[str, int]:
+    # Each line on stderr is "import time: <self us> | <cumulative us> | <module>"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            cwd=cwd,
+                            capture_output=True,
+                            text=True,
+                            check=True)
+    cumulative: dict[str, int] = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, _, cumulative_us, module = (part.strip() for part in line.replace('import time:', '|').split('|'))
+        cumulative[module] = int(cumulative_us)
+
+    return cumulative
+
+
+def time_command(arguments: list[str], cwd: str, repeat: int) -> float:
+    best: float = float('inf')
+
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        subprocess.run([sys.executable] + arguments, cwd=cwd, capture_output=True, check=True)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Measure package import and CLI start-up time.')
+    parser.add_argument('-n',
+                        '--repeat',
+                        type=int,
+                        default=10,
+                        help='The number of times to start the CLI; the fastest run is reported.')
+    parser.add_argument('--top',
+                        type=int,
+                        default=10,
+                        help='The number of slowest imports to list.')
+    args = parser.parse_args()
+
+    cwd: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    for statement in [f'import {PACKAGE}', f'from {PACKAGE} import App']:
+        cumulative: dict[str, int] = run_import_time(statement, cwd)
+        module: str = statement.split(' ')[1]
+        print(f'{statement}: {cumulative.get(module, 0) / 1000:8.2f} ms')
+
+    cumulative = run_import_time(f'from {PACKAGE} import App; App', cwd)
+    print('Slowest imports for the CLI:')
+
+    for module, us in sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f'  {us / 1000:8.2f} ms  {module}')
+
+    elapsed: float = time_command(['-m', PACKAGE, '--help'], cwd, args.repeat)
+    print(f'{PACKAGE} --help: {elapsed * 1000:8.2f} ms')
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
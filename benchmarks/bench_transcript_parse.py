@@ -0,0 +1,54 @@
+﻿import argparse
+import gc
+import random
+import time
+
+from src.kaldi_training_data_formatter import TranscriptLine
+
+
+def create_block(lines: int, seed: int = 0) -> str:
+    rng: random.Random = random.Random(seed)
+    words: list[str] = [f'word{i}' for i in range(5000)]
+
+    return ''.join(
+        f'[{i:08d}] {" ".join(rng.choices(words, k=rng.randint(5, 20)))}\n'
+        for i in range(lines)
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Compare per-line and block transcript parsing.')
+    parser.add_argument('-n',
+                        '--lines',
+                        type=int,
+                        default=1_000_000,
+                        help='The number of synthetic transcript lines to parse.')
+    parser.add_argument('--no-gc',
+                        action='store_true',
+                        help='Disable the cyclic garbage collector to time parsing without collection pauses.')
+    args = parser.parse_args()
+
+    block: str = create_block(args.lines)
+
+    if args.no_gc:
+        gc.disable()
+
+    start: float = time.perf_counter()
+    expected: list[TranscriptLine] = [TranscriptLine.from_line(line) for line in block.splitlines()]
+    elapsed: float = time.perf_counter() - start
+    print(f' from_line: {elapsed:8.3f} s {args.lines / elapsed:14,.0f} lines/s')
+
+    start = time.perf_counter()
+    line_ids, texts = TranscriptLine.parse_block(block)
+    elapsed = time.perf_counter() - start
+    print(f'parse_block: {elapsed:8.3f} s {args.lines / elapsed:14,.0f} lines/s')
+
+    if [line.id for line in expected] != line_ids or [line.text for line in expected] != texts:
+        print('Block parser produced different lines')
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+﻿import argparse
+import itertools
+import os.path
+import random
+from typing import Final
+
+PHONES: Final[list[str]] = [
+    'AA0', 'AA1', 'AE0', 'AE1', 'AH0', 'AH1', 'AO1', 'AW1', 'AY1', 'B', 'CH', 'D', 'DH', 'EH0', 'EH1', 'ER0', 'EY1',
+    'F', 'G', 'HH', 'IH0', 'IH1', 'IY0', 'IY1', 'JH', 'K', 'L', 'M', 'N', 'NG', 'OW0', 'OW1', 'OY1', 'P', 'R', 'S',
+    'SH', 'T', 'TH', 'UH1', 'UW0', 'UW1', 'V', 'W', 'Y', 'Z', 'ZH',
+]
+
+IMPORT_LEXICON_FILENAME: Final[str] = 'import-lexicon.txt'
+
+
+class CorpusStats:
+    def __init__(self, root: str, transcripts: int, lines: int, words: int, audio_files: int, lexicon_entries: int):
+        self.root: Final[str] = root
+        self.transcripts: Final[int] = transcripts
+        self.lines: Final[int] = lines
+        self.words: Final[int] = words
+        self.audio_files: Final[int] = audio_files
+        self.lexicon_entries: Final[int] = lexicon_entries
+
+    def to_dict(self) -> dict[str, int | str]:
+        return {
+            'root': self.root,
+            'transcripts': self.transcripts,
+            'lines': self.lines,
+            'words': self.words,
+            'audio_files': self.audio_files,
+            'lexicon_entries': self.lexicon_entries,
+        }
+
+
+def create_vocabulary(size: int, rng: random.Random) -> list[str]:
+    letters: str = 'abcdefghijklmnopqrstuvwxyz'
+
+    # The suffix keeps every word unique; the rank of a word is its index
+    return [''.join(rng.choices(letters, k=rng.randint(1, 8))) + str(i) for i in range(size)]
+
+
+def create_zipf_weights(size: int, exponent: float = 1.0) -> list[float]:
+    return list(itertools.accumulate(1.0 / (rank ** exponent) for rank in range(1, size + 1)))
+
+
+def generate_corpus(root: str,
+                    users: int = 10,
+                    projects: int = 2,
+                    chapters: int = 5,
+                    lines: int = 100,
+                    vocabulary_size: int = 10_000,
+                    lexicon_size: int = 8_000,
+                    audio: bool = True,
+                    seed: int = 0) -> CorpusStats:
+    rng: random.Random = random.Random(seed)
+    vocabulary: list[str] = create_vocabulary(vocabulary_size, rng)
+    cum_weights: list[float] = create_zipf_weights(vocabulary_size)
+    audio_root: str = os.path.join(root, 'audio')
+    transcript_count: int = 0
+    line_count: int = 0
+    word_count: int = 0
+    audio_count: int = 0
+
+    # Laid out as audio/<user>/<project>/<chapter>/<chapter>.trans.txt like ProjectUtil expects
+    for user in range(users):
+        for project in range(projects):
+            for chapter in range(chapters):
+                # Chapter IDs are unique per user so utterance IDs are unique across the corpus
+                chapter_id: str = f'{project * chapters + chapter:04d}'
+                directory: str = os.path.join(audio_root, f'user{user:04d}', f'project{user:04d}-{project:02d}', chapter_id)
+                os.makedirs(directory, exist_ok=True)
+
+                with open(os.path.join(directory, f'{chapter_id}.trans.txt'), mode='w', encoding='utf-8') as f:
+                    for line in range(lines):
+                        words: list[str] = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(5, 20))
+                        f.write(f'[{line:04d}] {" ".join(words).upper()}\n')
+                        word_count += len(words)
+
+                        if audio:
+                            open(os.path.join(directory, f'{line:04d}.flac'), mode='wb').close()
+                            audio_count += 1
+
+                transcript_count += 1
+                line_count += lines
+
+    # Covers the most frequent words first so lexicon misses fall on the rare ones
+    lexicon_entries: int = min(lexicon_size, vocabulary_size)
+
+    with open(os.path.join(root, IMPORT_LEXICON_FILENAME), mode='w', encoding='utf-8') as f:
+        for word in vocabulary[:lexicon_entries]:
+            f.write(f'{word.upper()}\t{" ".join(rng.choices(PHONES, k=rng.randint(2, 8)))}\n')
+
+    return CorpusStats(root, transcript_count, line_count, word_count, audio_count, lexicon_entries)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--users', type=int, default=10, help='The number of users (speakers).')
+    parser.add_argument('--projects', type=int, default=2, help='The number of projects per user.')
+    parser.add_argument('--chapters', type=int, default=5, help='The number of chapters per project.')
+    parser.add_argument('--lines', type=int, default=100, help='The number of lines per transcript.')
+    parser.add_argument('--vocabulary-size', type=int, default=10_000, help='The number of distinct words.')
+    parser.add_argument('--lexicon-size', type=int, default=8_000, help='The number of words in the import lexicon.')
+    parser.add_argument('--no-audio', action='store_true', help='Do not create empty audio files for each line.')
+    parser.add_argument('--seed', type=int, default=0, help='The seed for the random number generator.')
+
+
+def generate_from_args(root: str, args: argparse.Namespace) -> CorpusStats:
+    return generate_corpus(root,
+                           users=args.users,
+                           projects=args.projects,
+                           chapters=args.chapters,
+                           lines=args.lines,
+                           vocabulary_size=args.vocabulary_size,
+                           lexicon_size=args.lexicon_size,
+                           audio=not args.no_audio,
+                           seed=args.seed)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Generate a synthetic corpus laid out like a real one.')
+    parser.add_argument('root', type=str, help='The directory to generate the corpus in.')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    stats: CorpusStats = generate_from_args(args.root, args)
+    print(f'Generated {stats.transcripts} transcripts with {stats.lines} lines and {stats.words} words in: '
+          f'"{stats.root}"')
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
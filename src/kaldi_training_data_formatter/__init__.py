@@ -1,16 +1,68 @@
-﻿# No dependencies
-from .chapter import Chapter
-from .transcript_line import TranscriptLine
-from .project_util import ProjectUtil
-
-# Depends on the above
-from .abstract_file_reader import AbstractFileReader
-from .transcript_reader import TranscriptReader
-
-# Depends on the above
-from .files_util import FilesUtil
-from .lexicon_compiler import LexiconCompiler
-from .vocab_compiler import VocabCompiler
-
-# Import app last
-from .app import App
+﻿import importlib
+from typing import Any
+
+# Modules are only imported when one of their names is first used, which keeps the CLI quick to start
+_MODULES: dict[str, str] = {
+    # No dependencies
+    'Compression': '.compression_util',
+    'CompressionUtil': '.compression_util',
+    'Chapter': '.chapter',
+    'TranscriptLine': '.transcript_line',
+    'ProjectUtil': '.project_util',
+    'CorpusCrawler': '.corpus_crawler',
+    'AtomicWriter': '.atomic_writer',
+    'JsonManifest': '.json_manifest',
+    'ExternalSorter': '.external_sort',
+    'SortOrder': '.external_sort',
+    'BuildCache': '.build_cache',
+    'VocabularyIndex': '.vocabulary_index',
+    'PhoneLexicon': '.phone_lexicon',
+    'BloomFilter': '.bloom_filter',
+
+    # Depends on the above
+    'AbstractFileReader': '.abstract_file_reader',
+    'ReaderBackend': '.abstract_file_reader',
+    'LexiconReader': '.lexicon_reader',
+    'LexiconIndex': '.lexicon_index',
+    'TranscriptReader': '.transcript_reader',
+    'TranscriptTable': '.transcript_table',
+    'CorpusEntry': '.corpus_index',
+    'CorpusIndex': '.corpus_index',
+    'AudioInfo': '.audio_metadata',
+    'AudioMetadata': '.audio_metadata',
+    'AudioMetadataIndex': '.audio_metadata',
+    'ProfileMode': '.stage_profiler',
+    'StageProfiler': '.stage_profiler',
+    'Instrumentation': '.instrumentation',
+    'NullStage': '.instrumentation',
+    'StageMetrics': '.instrumentation',
+
+    # Depends on the above
+    'DuplicateDetector': '.duplicate_detector',
+    'FilesUtil': '.files_util',
+    'DataDirWriter': '.data_dir_writer',
+    'LexiconCompiler': '.lexicon_compiler',
+    'VocabCompiler': '.vocab_compiler',
+    'ShardMerger': '.shard_merger',
+
+    # Depends on everything
+    'App': '.app',
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str) -> Any:
+    module_name: str | None = _MODULES.get(name)
+
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value: Any = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Later lookups find the name without calling __getattr__
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
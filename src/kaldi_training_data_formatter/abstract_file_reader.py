@@ -1,18 +1,39 @@
-﻿import os.path
+﻿import codecs
+import mmap
+import os.path
 from abc import ABC
-from io import TextIOWrapper
+from enum import Enum
+from io import BufferedReader, BytesIO, StringIO
+from typing import TextIO
+
+from src.kaldi_training_data_formatter import CompressionUtil
+
+
+class ReaderBackend(Enum):
+    # Buffered text stream
+    Stream = 0
+
+    # Memory-mapped bytes, decoded one line or batch at a time; UTF-8 only, compressed files are streamed
+    Mmap = 1
 
 
 class AbstractFileReader(ABC):
-    def __init__(self, path: str, encoding: str, is_file: bool = True):
+    def __init__(self, path: str, encoding: str, is_file: bool = True, backend: ReaderBackend = ReaderBackend.Stream):
         # Init fields
         self.__encoding = encoding
-        self.__file: TextIOWrapper | None = None
+        self.__backend: ReaderBackend = backend
+        self.__file: TextIO | None = None
+        self.__binary_file: BufferedReader | None = None
+        self.__map: mmap.mmap | BytesIO | None = None
+        self.__pending_lines: list[str] = []  # Lines split off the last mapped line, in reverse order
         self.__is_closed: bool = False
 
         # Init property values
         self.__current_line = 0
 
+        if backend == ReaderBackend.Mmap and codecs.lookup(encoding).name not in ('utf-8', 'utf-8-sig'):
+            raise Exception(f'Memory-mapped reading only supports UTF-8: "{encoding}"')
+
         if is_file:
             if not os.path.isfile(path):
                 raise Exception(f'path is not a file: "{path}"')
@@ -28,6 +49,10 @@ class AbstractFileReader(ABC):
             self.__filepath = None
             self.__filename = None
 
+    @property
+    def backend(self) -> ReaderBackend:
+        return self.__backend
+
     @property
     def directory(self) -> str:
         return self.__directory
@@ -45,6 +70,9 @@ class AbstractFileReader(ABC):
         return self.__filepath
 
     def _read_line(self) -> str | None:
+        if self.__map is not None:
+            return self.__read_mapped_line()
+
         line: str = self.__file.readline()
 
         # Checks for no text (blank lines will still have new-line character)
@@ -55,8 +83,86 @@ class AbstractFileReader(ABC):
 
         return line.strip('\n\r ')
 
+    def _read_lines(self, size_hint: int) -> list[str] | None:
+        if self.__map is not None:
+            return self.__read_mapped_lines(size_hint)
+
+        # Reads whole lines up to roughly `size_hint` characters, leaving line endings in place
+        lines: list[str] = self.__file.readlines(size_hint)
+
+        if not lines:
+            return None
+
+        self.__current_line += len(lines)
+
+        return lines
+
+    def __read_mapped_line(self) -> str | None:
+        if not self.__pending_lines:
+            line: bytes = self.__map.readline()
+
+            if not line:
+                return None
+
+            carriage_return: int = line.find(b'\r')
+
+            # Without a carriage return inside the line there is nothing to translate, which is the common case
+            if carriage_return == -1 or line[carriage_return + 1:] in (b'', b'\n'):
+                self.__current_line += 1
+
+                return line.strip(b'\n\r ').decode('utf-8')
+
+            # The map only splits at '\n', but a lone '\r' also ends a line in a text stream
+            self.__pending_lines = StringIO(line.decode('utf-8'), newline=None).readlines()
+            self.__pending_lines.reverse()
+
+        self.__current_line += 1
+
+        return self.__pending_lines.pop().strip('\n\r ')
+
+    def __read_mapped_lines(self, size_hint: int) -> list[str] | None:
+        # Hand out what is left of a line split by __read_mapped_line first
+        if self.__pending_lines:
+            lines: list[str] = self.__pending_lines[::-1]
+            self.__pending_lines = []
+            self.__current_line += len(lines)
+
+            return lines
+
+        mapped: mmap.mmap | BytesIO = self.__map
+        chunk: bytes = mapped.read(max(1, size_hint))
+
+        if not chunk:
+            return None
+
+        # Finish the line the batch stops in, so multi-byte characters are never split
+        if not chunk.endswith(b'\n'):
+            chunk += mapped.readline()
+
+        # Translate new-lines the same way a text stream does
+        lines: list[str] = StringIO(chunk.decode('utf-8'), newline=None).readlines()
+        self.__current_line += len(lines)
+
+        return lines
+
     def __enter__(self):
-        self.__file = open(self._filepath, mode='r', encoding=self.__encoding)
+        # Compressed files can only be streamed
+        if self.__backend == ReaderBackend.Mmap and CompressionUtil.detect(self._filepath) is None:
+            self.__binary_file = open(self._filepath, mode='rb')
+
+            # Empty files cannot be mapped
+            if os.fstat(self.__binary_file.fileno()).st_size == 0:
+                self.__map = BytesIO()
+            else:
+                self.__map = mmap.mmap(self.__binary_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            # Skip the BOM like the 'utf-8-sig' codec does
+            if codecs.lookup(self.__encoding).name == 'utf-8-sig' and self.__map.read(3) != codecs.BOM_UTF8:
+                self.__map.seek(0)
+
+            return self
+
+        self.__file = CompressionUtil.open_text(self._filepath, self.__encoding)
 
         return self
 
@@ -67,3 +173,11 @@ class AbstractFileReader(ABC):
         if self.__file is not None:
             self.__file.close()
             self.__file = None
+
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+
+        if self.__binary_file is not None:
+            self.__binary_file.close()
+            self.__binary_file = None
@@ -1,38 +1,267 @@
 ﻿import argparse
 import os.path
+from typing import TYPE_CHECKING, Tuple
 
-from src.kaldi_training_data_formatter import VocabCompiler, FilesUtil, LexiconCompiler
+if TYPE_CHECKING:
+    from src.kaldi_training_data_formatter import Instrumentation
 
 
 class App:
     def __init__(self):
         parser = argparse.ArgumentParser()
+        parser.add_argument('--cache',
+                            action='store_true',
+                            help='Reuse vocabulary from transcripts that did not change since the last run.')
+        parser.add_argument('--check-duplicates',
+                            action='store_true',
+                            help='Stop with an error when an utterance ID appears more than once in the corpus.')
+        parser.add_argument('--data-dir',
+                            type=str,
+                            help='The directory to write the Kaldi data directory (text, wav.scp, utt2spk, spk2utt) to.')
+        parser.add_argument('--dry-run',
+                            action='store_true',
+                            help='Report how audio files would be renamed without renaming them.')
         parser.add_argument('--import-lexicon',
                             type=str,
                             help='The filename of the lexicon to import phones from.')
+        parser.add_argument('-j',
+                            '--jobs',
+                            type=int,
+                            default=1,
+                            help='The number of parallel workers to read transcripts and format audio files with.')
+        parser.add_argument('--metrics-json',
+                            type=str,
+                            help='The filename to write per-stage timings and counters to as JSON.')
+        parser.add_argument('--metrics-prom',
+                            type=str,
+                            help='The filename to write per-stage timings and counters to as a Prometheus text file.')
+        parser.add_argument('--profile',
+                            choices=['cpu', 'mem'],
+                            help='Write a cProfile file or a tracemalloc report for each stage to the root directory.')
+        parser.add_argument('--scan-concurrency',
+                            type=int,
+                            default=1,
+                            help='The number of directories to list at once while discovering transcripts.')
+        parser.add_argument('--shard',
+                            type=App.__parse_shard,
+                            help='Only process shard i of N (counting from 0, e.g. 2/8) and write partial outputs '
+                                 'that the merge command combines.')
+        parser.add_argument('--sort-buffer',
+                            type=int,
+                            help='The number of lines to sort in memory before spilling sorted runs to disk.')
+        parser.add_argument('--sort-order',
+                            choices=['codepoint', 'c'],
+                            default='codepoint',
+                            help='Sort output by Python code point or by C-locale byte order.')
         parser.add_argument('-v',
                             '--verbose',
-                            action='store_true')
+                            action='store_true',
+                            help='Print per-stage timings and counters when done.')
         parser.add_argument('-r',
                             '--root',
                             type=str,
                             help='The root directory to run the app in.')
+
+        subparsers = parser.add_subparsers(dest='command')
+        index_parser = subparsers.add_parser('compile-lexicon-index',
+                                             help='Compile a text lexicon into a binary index that can be imported.')
+        index_parser.add_argument('source',
+                                  type=str,
+                                  help='The filename of the text lexicon to compile.')
+        index_parser.add_argument('output',
+                                  type=str,
+                                  help='The filename of the binary lexicon index to write.')
+        subparsers.add_parser('merge',
+                              help='Merge the partial vocabularies and lexicons written by --shard runs.')
         args = parser.parse_args()
 
+        self.__args: argparse.Namespace = args
         self.__root: str = args.root if args.root else os.getcwd()
-        self.__lexicon_compiler: LexiconCompiler = LexiconCompiler.from_root(self.__root,
-                                                                             True,
-                                                                             import_name=args.import_lexicon)
-        self.__vocab_compiler: VocabCompiler = VocabCompiler.from_root(self.__root)
 
     def run(self) -> int:
+        if self.__args.command == 'compile-lexicon-index':
+            return self.__compile_lexicon_index()
+
+        if self.__args.command == 'merge':
+            return self.__merge()
+
+        # Imported and constructed here so other commands and --help do not pay for the pipeline
+        from src.kaldi_training_data_formatter import (AudioMetadataIndex, BuildCache, CorpusIndex, DataDirWriter,
+                                                       DuplicateDetector, ExternalSorter, FilesUtil, Instrumentation,
+                                                       LexiconCompiler, ProfileMode, SortOrder, StageProfiler,
+                                                       VocabCompiler)
+
+        args: argparse.Namespace = self.__args
         audio_root: str = os.path.join(self.__root, 'audio')
+        profiler: StageProfiler | None = None
+
+        if args.profile:
+            profiler = StageProfiler(ProfileMode.Cpu if args.profile == 'cpu' else ProfileMode.Memory, self.__root)
+
+        instrumentation: Instrumentation = Instrumentation(
+            args.verbose or args.metrics_json is not None or args.metrics_prom is not None,
+            profiler)
+        sort_order: SortOrder = SortOrder.CLocale if args.sort_order == 'c' else SortOrder.CodePoint
+        lexicon_compiler: LexiconCompiler = LexiconCompiler.from_root(self.__root,
+                                                                      True,
+                                                                      import_name=args.import_lexicon,
+                                                                      max_sort_lines=args.sort_buffer,
+                                                                      sort_order=sort_order)
+        vocab_compiler: VocabCompiler = VocabCompiler.from_root(self.__root,
+                                                                args.jobs,
+                                                                args.cache,
+                                                                max_sort_lines=args.sort_buffer,
+                                                                sort_order=sort_order,
+                                                                cache_filename=self.__get_output_name(
+                                                                    BuildCache.VOCABULARY_FILENAME))
+
+        with instrumentation.stage('scan') as stage:
+            index: CorpusIndex = CorpusIndex.from_root(self.__root, args.scan_concurrency)
+            stage.add('files_visited', index.directories_visited)
+            stage.add('transcripts_found', len(index))
+
+            if args.shard:
+                index = index.shard(*args.shard)
+                stage.add('transcripts_in_shard', len(index))
+
+        if args.check_duplicates:
+            with instrumentation.stage('check_duplicates') as stage:
+                duplicates: dict[str, list[Tuple[str, int]]] = DuplicateDetector().find_duplicates(index)
+                stage.add('duplicate_ids', len(duplicates))
+
+            # Duplicates would break the sorted Kaldi files, so stop before writing anything
+            if len(duplicates) > 0:
+                for line in DuplicateDetector.format_duplicates(duplicates):
+                    print(line)
+
+                self.__report_metrics(instrumentation)
+
+                return 1
+
+        with instrumentation.stage('read_vocabulary') as stage:
+            vocab_compiler.read_vocabulary(index)
+            stage.add('bytes_read', vocab_compiler.bytes_read)
+            stage.add('transcripts_parsed', vocab_compiler.transcripts_read)
+            stage.add('lines_parsed', vocab_compiler.lines_read)
+            stage.add('words_added', len(vocab_compiler.vocabulary))
+
+        with instrumentation.stage('save_vocabulary') as stage:
+            # Shards keep the counts so the partial vocabularies can be merged
+            if args.shard:
+                vocab_compiler.save_vocabulary_counts(self.__get_output_name(VocabCompiler.VOCAB_COUNTS_FILENAME))
+            else:
+                vocab_compiler.save_vocabulary()
+
+            stage.add('bytes_written', vocab_compiler.bytes_written)
+            stage.add('lines_written', len(vocab_compiler.vocabulary))
+
+        with instrumentation.stage('compile_lexicon') as stage:
+            lexicon_compiler.compile_lexicon(vocab_compiler.vocabulary)
+            stage.add('bytes_read', lexicon_compiler.bytes_read)
+            stage.add('words_added', len(lexicon_compiler.lexicon))
+
+        with instrumentation.stage('save_lexicon') as stage:
+            lexicon_compiler.save_lexicon(self.__get_output_name(LexiconCompiler.LEXICON_FILENAME))
+            stage.add('bytes_written', lexicon_compiler.bytes_written)
+            stage.add('lines_written', lexicon_compiler.lines_written)
+
+        with instrumentation.stage('format_audio_files') as stage:
+            renames: list[Tuple[str, str]] = FilesUtil.format_audio_files(audio_root, index, args.jobs, args.dry_run)
+            stage.add('files_renamed', len(renames))
+
+            # Only worth another pass over the index when the metrics are reported
+            if instrumentation.enabled:
+                stage.add('files_visited', len(index.subset(audio_root)))
+
+        if args.data_dir:
+            audio_index: AudioMetadataIndex = AudioMetadataIndex(
+                self.__root, self.__get_output_name(AudioMetadataIndex.AUDIO_FILENAME))
+
+            with instrumentation.stage('read_audio_metadata') as stage:
+                audio_paths: list[str] = FilesUtil.find_audio_files(index, args.jobs)
+                audio_index.load()
+                stage.add('files_visited', len(audio_paths))
+                stage.add('headers_read', audio_index.update(audio_paths, args.jobs))
+                audio_index.save()
+
+            with instrumentation.stage('write_data_dir') as stage:
+                data_dir: str = os.path.join(self.__root, self.__get_output_name(args.data_dir))
+                max_lines: int = args.sort_buffer if args.sort_buffer is not None else ExternalSorter.MAX_LINES
+                utterance_count: int = DataDirWriter(data_dir, max_lines, audio_index).write(index)
+                stage.add('lines_written', utterance_count)
+
+        self.__report_metrics(instrumentation)
+
+        return 0
+
+    def __report_metrics(self, instrumentation: 'Instrumentation') -> None:
+        if self.__args.verbose:
+            print(instrumentation.format_summary())
+
+        if instrumentation.profiler is not None:
+            for path in instrumentation.profiler.paths:
+                print(f'Wrote profile: "{path}"')
+
+        try:
+            if self.__args.metrics_json:
+                instrumentation.write_json(os.path.join(self.__root, self.__args.metrics_json))
+
+            if self.__args.metrics_prom:
+                instrumentation.write_prometheus(os.path.join(self.__root, self.__args.metrics_prom))
+        except Exception as e:
+            print('Error while writing metrics: ' + str(e))
+
+    def __get_output_name(self, filename: str) -> str:
+        from src.kaldi_training_data_formatter import ShardMerger
+
+        # Shards share the root, so each one writes its own files
+        return ShardMerger.get_shard_filename(filename, *self.__args.shard) if self.__args.shard else filename
+
+    def __merge(self) -> int:
+        from src.kaldi_training_data_formatter import LexiconCompiler, ShardMerger, SortOrder, VocabCompiler
+
+        sort_order: SortOrder = SortOrder.CLocale if self.__args.sort_order == 'c' else SortOrder.CodePoint
+        merger: ShardMerger = ShardMerger(self.__root, sort_order)
+
+        try:
+            vocab_paths: list[str] = merger.find_shard_files(VocabCompiler.VOCAB_COUNTS_FILENAME)
+            lexicon_paths: list[str] = merger.find_shard_files(LexiconCompiler.LEXICON_FILENAME)
+            word_count: int = merger.merge_vocabulary(vocab_paths, VocabCompiler.VOCAB_FILENAME)
+            line_count: int = merger.merge_lexicon(lexicon_paths, LexiconCompiler.LEXICON_FILENAME)
+        except Exception as e:
+            print('Error while merging shards: ' + str(e))
+            return 1
+
+        print(f'Merged {len(vocab_paths)} shards into {word_count} words and {line_count} lexicon lines')
+
+        return 0
+
+    @staticmethod
+    def __parse_shard(value: str) -> Tuple[int, int]:
+        shard, _, shard_count = value.partition('/')
+
+        try:
+            result: Tuple[int, int] = int(shard), int(shard_count)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f'expected i/N, got "{value}"')
+
+        if result[1] < 1 or not 0 <= result[0] < result[1]:
+            raise argparse.ArgumentTypeError(f'shard must be between 0 and N - 1, got "{value}"')
+
+        return result
+
+    def __compile_lexicon_index(self) -> int:
+        from src.kaldi_training_data_formatter import LexiconIndex
+
+        source: str = os.path.join(self.__root, self.__args.source)
+        output: str = os.path.join(self.__root, self.__args.output)
 
-        self.__vocab_compiler.read_vocabulary()
-        self.__vocab_compiler.save_vocabulary()
-        self.__lexicon_compiler.compile_lexicon(self.__vocab_compiler.vocabulary)
-        self.__lexicon_compiler.save_lexicon()
+        try:
+            word_count: int = LexiconIndex.compile(source, output)
+        except Exception as e:
+            print('Error while compiling lexicon index: ' + str(e))
+            return 1
 
-        FilesUtil.format_audio_files(audio_root)
+        print(f'Compiled {word_count} words into lexicon index: "{output}"')
 
         return 0
@@ -0,0 +1,76 @@
+﻿import os.path
+import secrets
+from io import TextIOWrapper
+from typing import Final, Iterable
+
+
+class AtomicWriter:
+    BUFFER_SIZE: Final[int] = 1 << 20
+    BATCH_LINES: Final[int] = 4096
+
+    def __init__(self, path: str, encoding: str = 'utf-8', buffer_size: int = BUFFER_SIZE):
+        self.__path: Final[str] = path
+        self.__encoding: Final[str] = encoding
+        self.__buffer_size: Final[int] = buffer_size
+        self.__temp_path: str | None = None
+        self.__file: TextIOWrapper | None = None
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def write(self, text: str) -> None:
+        self.__file.write(text)
+
+    def write_lines(self, lines: Iterable[str]) -> None:
+        batch: list[str] = []
+
+        for line in lines:
+            batch.append(line)
+
+            if len(batch) >= AtomicWriter.BATCH_LINES:
+                batch.append('')  # Ends the joined chunk with a new-line
+                self.__file.write('\n'.join(batch))
+                batch.clear()
+
+        if len(batch) > 0:
+            batch.append('')
+            self.__file.write('\n'.join(batch))
+
+    def __enter__(self):
+        directory: str = os.path.dirname(self.__path)
+        filename: str = os.path.basename(self.__path)
+
+        # Write next to the target so the final rename stays on one file system
+        self.__temp_path = os.path.join(directory, f'.{filename}.{secrets.token_hex(4)}.tmp')
+        self.__file = open(self.__temp_path,
+                           mode='x',
+                           encoding=self.__encoding,
+                           buffering=self.__buffer_size)
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.__file is None:
+            return
+
+        succeeded: bool = exc_type is None
+
+        try:
+            if succeeded:
+                self.__file.flush()
+                os.fsync(self.__file.fileno())
+        except OSError:
+            succeeded = False
+            raise
+        finally:
+            self.__file.close()
+            self.__file = None
+
+            # Readers only ever see the old file or the complete new one
+            if succeeded:
+                os.replace(self.__temp_path, self.__path)
+            else:
+                os.remove(self.__temp_path)
+
+            self.__temp_path = None
@@ -0,0 +1,196 @@
+﻿import os.path
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Final, Iterable
+
+from src.kaldi_training_data_formatter import BuildCache, JsonManifest
+
+
+class AudioInfo:
+    __slots__ = ('__sample_rate', '__channels', '__frame_count')
+
+    def __init__(self, sample_rate: int, channels: int, frame_count: int):
+        self.__sample_rate: Final[int] = sample_rate
+        self.__channels: Final[int] = channels
+        self.__frame_count: Final[int] = frame_count
+
+    @property
+    def channels(self) -> int:
+        return self.__channels
+
+    @property
+    def duration(self) -> float:
+        return self.__frame_count / self.__sample_rate if self.__sample_rate > 0 else 0.0
+
+    @property
+    def frame_count(self) -> int:
+        return self.__frame_count
+
+    @property
+    def sample_rate(self) -> int:
+        return self.__sample_rate
+
+    def __eq__(self, other) -> bool:
+        if other is None:
+            return False
+
+        if self is other:
+            return True
+
+        if not isinstance(other, AudioInfo):
+            return False
+
+        return (self.sample_rate == other.sample_rate
+                and self.channels == other.channels
+                and self.frame_count == other.frame_count)
+
+
+class AudioMetadata:
+    FLAC_MAGIC: Final[bytes] = b'fLaC'
+    ID3_MAGIC: Final[bytes] = b'ID3'
+
+    @staticmethod
+    def read(path: str) -> AudioInfo | None:
+        extension: str = os.path.splitext(path)[1].lower()
+
+        try:
+            match extension:
+                case '.wav':
+                    return AudioMetadata.read_wav(path)
+
+                case '.flac':
+                    return AudioMetadata.read_flac(path)
+
+                case _:
+                    return None  # No header reader for this format
+        except Exception:
+            return None  # Reported once for all files by whoever needs the duration
+
+    @staticmethod
+    def read_flac(path: str) -> AudioInfo:
+        with open(path, mode='rb') as f:
+            header: bytes = f.read(10)
+
+            # Some encoders put an ID3v2 tag in front of the stream
+            if header[:3] == AudioMetadata.ID3_MAGIC and len(header) == 10:
+                size: int = ((header[6] & 0x7f) << 21
+                             | (header[7] & 0x7f) << 14
+                             | (header[8] & 0x7f) << 7
+                             | (header[9] & 0x7f))
+                footer_size: int = 10 if header[5] & 0x10 else 0
+                f.seek(10 + size + footer_size)
+            else:
+                f.seek(0)
+
+            # Magic, block header and STREAMINFO, which is always the first metadata block
+            block: bytes = f.read(4 + 4 + 34)
+
+        if block[:4] != AudioMetadata.FLAC_MAGIC:
+            raise Exception('Not a FLAC stream')
+
+        if len(block) < 42 or block[4] & 0x7f != 0:
+            raise Exception('Missing STREAMINFO block')
+
+        # Sample rate (20 bits), channels - 1 (3 bits), bits per sample - 1 (5 bits) and total samples (36 bits)
+        packed: int = int.from_bytes(block[18:26], 'big')
+
+        return AudioInfo(packed >> 44, ((packed >> 41) & 0x7) + 1, packed & 0xfffffffff)
+
+    @staticmethod
+    def read_wav(path: str) -> AudioInfo:
+        with wave.open(path, mode='rb') as f:
+            return AudioInfo(f.getframerate(), f.getnchannels(), f.getnframes())
+
+
+class AudioMetadataIndex:
+    CACHE_DIRNAME: Final[str] = BuildCache.CACHE_DIRNAME
+    AUDIO_FILENAME: Final[str] = 'audio.json'
+    __VERSION: Final[int] = 1
+
+    def __init__(self, root: str, filename: str = AUDIO_FILENAME):
+        self.__root: Final[str] = root
+        self.__directory: Final[str] = os.path.join(root, AudioMetadataIndex.CACHE_DIRNAME)
+        self.__manifest: Final[JsonManifest] = JsonManifest(os.path.join(self.__directory, filename),
+                                                            AudioMetadataIndex.__VERSION)
+        self.__entries: Final[dict[str, dict[str, Any]]] = {}
+        self.__changed: bool = False
+
+    @property
+    def directory(self) -> str:
+        return self.__directory
+
+    def get(self, path: str) -> AudioInfo | None:
+        entry: dict[str, Any] | None = self.__entries.get(self.__key(path))
+
+        if entry is None or entry['info'] is None:
+            return None
+
+        return AudioInfo(*entry['info'])
+
+    def get_duration(self, path: str) -> float | None:
+        info: AudioInfo | None = self.get(path)
+
+        return info.duration if info is not None else None
+
+    def get_total_duration(self, paths: Iterable[str]) -> float:
+        return sum(duration for duration in map(self.get_duration, paths) if duration is not None)
+
+    def load(self) -> None:
+        self.__entries.clear()
+        self.__changed = False
+
+        try:
+            self.__entries.update(self.__manifest.load())
+        except Exception as e:
+            print('Error while reading audio index, rebuilding: ' + str(e))
+
+    def save(self) -> None:
+        if not self.__changed:
+            return
+
+        try:
+            self.__manifest.save(self.__entries)
+            self.__changed = False
+        except Exception as e:
+            print('Error while saving audio index: ' + str(e))
+
+    def update(self, paths: Iterable[str], jobs: int = 1) -> int:
+        paths = list(paths)
+        keys: set[str] = {self.__key(path) for path in paths}
+
+        # Forget files that are no longer part of the corpus
+        for key in [k for k in self.__entries.keys() if k not in keys]:
+            del self.__entries[key]
+            self.__changed = True
+
+        # Both the stat and the header read are bound by file system latency and not CPU, so check files on a pool
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            entries: list[dict[str, Any] | None] = list(executor.map(self.__read_if_changed, paths))
+
+        changed_count: int = 0
+
+        for path, entry in zip(paths, entries):
+            if entry is not None:
+                self.__entries[self.__key(path)] = entry
+                self.__changed = True
+                changed_count += 1
+
+        return changed_count
+
+    def __key(self, path: str) -> str:
+        return os.path.relpath(path, self.__root)
+
+    def __read_if_changed(self, path: str) -> dict[str, Any] | None:
+        stat: os.stat_result = os.stat(path)
+        entry: dict[str, Any] | None = self.__entries.get(self.__key(path))
+
+        if entry is not None and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return None
+
+        info: AudioInfo | None = AudioMetadata.read(path)
+
+        return {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'info': [info.sample_rate, info.channels, info.frame_count] if info is not None else None,
+        }
@@ -0,0 +1,51 @@
+﻿import math
+from typing import Final
+
+
+class BloomFilter:
+    __slots__ = ('__bit_count', '__bits', '__hash_count')
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if not 0.0 < error_rate < 1.0:
+            raise Exception(f'Error rate must be between 0 and 1: {error_rate}')
+
+        # Optimal sizes for `capacity` items at the requested false positive rate
+        capacity = max(1, capacity)
+        self.__bit_count: Final[int] = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.__hash_count: Final[int] = max(1, round(self.__bit_count / capacity * math.log(2)))
+        self.__bits: Final[bytearray] = bytearray((self.__bit_count + 7) // 8)
+
+    @property
+    def bit_count(self) -> int:
+        return self.__bit_count
+
+    @property
+    def hash_count(self) -> int:
+        return self.__hash_count
+
+    def add(self, item: str) -> bool:
+        # Returns whether the item may have been added before
+        bits: bytearray = self.__bits
+        found: bool = True
+
+        for index in self.__indices(item):
+            mask: int = 1 << (index & 7)
+
+            if not bits[index >> 3] & mask:
+                bits[index >> 3] |= mask
+                found = False
+
+        return found
+
+    def __indices(self, item: str) -> list[int]:
+        # Double hashing; the string hash is salted per process, which is fine for a filter that is never saved
+        value: int = hash(item) & 0xffffffffffffffff
+        first: int = value & 0xffffffff
+        second: int = (value >> 32) | 1
+
+        return [(first + i * second) % self.__bit_count for i in range(self.__hash_count)]
+
+    def __contains__(self, item: str) -> bool:
+        bits: bytearray = self.__bits
+
+        return all(bits[index >> 3] & (1 << (index & 7)) for index in self.__indices(item))
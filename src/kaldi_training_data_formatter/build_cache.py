@@ -0,0 +1,62 @@
+﻿import os.path
+from typing import Any, Final
+
+from src.kaldi_training_data_formatter import JsonManifest
+
+
+class BuildCache:
+    CACHE_DIRNAME: Final[str] = '.ktdf-cache'
+    VOCABULARY_FILENAME: Final[str] = 'vocabulary.json'
+    __VERSION: Final[int] = 2
+
+    def __init__(self, root: str, filename: str = VOCABULARY_FILENAME):
+        self.__root: Final[str] = root
+        self.__directory: Final[str] = os.path.join(root, BuildCache.CACHE_DIRNAME)
+        self.__manifest: Final[JsonManifest] = JsonManifest(os.path.join(self.__directory, filename),
+                                                            BuildCache.__VERSION)
+        self.__entries: Final[dict[str, dict[str, Any]]] = {}
+
+    @property
+    def directory(self) -> str:
+        return self.__directory
+
+    def get_counts(self, path: str, stat: os.stat_result) -> dict[str, int] | None:
+        entry: dict[str, Any] | None = self.__entries.get(self.__key(path))
+
+        if entry is None or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+            return None
+
+        return entry['counts']
+
+    def load(self) -> None:
+        self.__entries.clear()
+
+        try:
+            self.__entries.update(self.__manifest.load())
+        except Exception as e:
+            print('Error while reading build cache, rebuilding: ' + str(e))
+
+    def put_counts(self, path: str, stat: os.stat_result, counts: dict[str, int]) -> None:
+        self.__entries[self.__key(path)] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'counts': counts,
+        }
+
+    def retain(self, paths: list[str]) -> int:
+        keys: set[str] = {self.__key(path) for path in paths}
+        removed_keys: list[str] = [k for k in self.__entries.keys() if k not in keys]
+
+        for key in removed_keys:
+            del self.__entries[key]
+
+        return len(removed_keys)
+
+    def save(self) -> None:
+        try:
+            self.__manifest.save(self.__entries)
+        except Exception as e:
+            print('Error while saving build cache: ' + str(e))
+
+    def __key(self, path: str) -> str:
+        return os.path.relpath(path, self.__root)
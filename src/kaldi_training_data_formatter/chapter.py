@@ -1,4 +1,6 @@
 ﻿class Chapter:
+    __slots__ = ('__id', '__project_id', '__song_id', '__speaker_id', '__subset')
+
     def __init__(self, init_id: int):
         self.__id: int = init_id
         self.__project_id: int = 0
@@ -0,0 +1,88 @@
+﻿import bz2
+import gzip
+import lzma
+import os.path
+from enum import Enum
+from io import TextIOWrapper
+from typing import Final, TextIO
+
+
+class Compression(Enum):
+    Gzip = 0
+    Bz2 = 1
+    Lzma = 2
+    Zstd = 3  # Needs the optional zstandard package
+
+
+class CompressionUtil:
+    EXTENSIONS: Final[dict[str, Compression]] = {
+        '.gz': Compression.Gzip,
+        '.bz2': Compression.Bz2,
+        '.xz': Compression.Lzma,
+        '.lzma': Compression.Lzma,
+        '.zst': Compression.Zstd,
+    }
+    MAGIC_BYTES: Final[dict[bytes, Compression]] = {
+        b'\x1f\x8b': Compression.Gzip,
+        b'BZh': Compression.Bz2,
+        b'\xfd7zXZ\x00': Compression.Lzma,
+        b'\x28\xb5\x2f\xfd': Compression.Zstd,
+    }
+    __MAGIC_LENGTH: Final[int] = 6
+
+    @staticmethod
+    def detect(path: str, header: bytes | None = None) -> Compression | None:
+        compression: Compression | None = CompressionUtil.EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+        if compression is not None:
+            return compression
+
+        if header is None:
+            with open(path, mode='rb') as f:
+                header = f.read(CompressionUtil.__MAGIC_LENGTH)
+
+        return next((c for magic, c in CompressionUtil.MAGIC_BYTES.items() if header.startswith(magic)), None)
+
+    @staticmethod
+    def open_text(path: str, encoding: str) -> TextIO:
+        binary_file = open(path, mode='rb')
+
+        try:
+            compression: Compression | None = CompressionUtil.detect(
+                path, binary_file.peek(CompressionUtil.__MAGIC_LENGTH)[:CompressionUtil.__MAGIC_LENGTH])
+        except BaseException:
+            binary_file.close()
+            raise
+
+        # Plain text is read through the file that is already open, like `open(path, encoding=...)` would
+        if compression is None:
+            return TextIOWrapper(binary_file, encoding=encoding)
+
+        binary_file.close()
+
+        match compression:
+            case Compression.Gzip:
+                return gzip.open(path, mode='rt', encoding=encoding)
+
+            case Compression.Bz2:
+                return bz2.open(path, mode='rt', encoding=encoding)
+
+            case Compression.Lzma:
+                return lzma.open(path, mode='rt', encoding=encoding)
+
+            case Compression.Zstd:
+                try:
+                    import zstandard
+                except ImportError:
+                    raise Exception(f'The zstandard package is needed to read "{path}"')
+
+                return zstandard.open(path, mode='rt', encoding=encoding)
+
+            case _:
+                raise Exception(f'Invalid compression {compression}')
+
+    @staticmethod
+    def strip_extension(filename: str) -> str:
+        stem, extension = os.path.splitext(filename)
+
+        return stem if extension.lower() in CompressionUtil.EXTENSIONS else filename
@@ -0,0 +1,81 @@
+﻿import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Final, Tuple
+
+from src.kaldi_training_data_formatter import CompressionUtil
+
+# Transcript path of a directory, or its subdirectories when it has no transcript
+DirectoryListing = Tuple[str | None, list[str]]
+
+
+class CorpusCrawler:
+    TRANSCRIPT_EXTENSION: Final[str] = '.trans.txt'
+
+    def __init__(self, concurrency: int = 16):
+        self.__concurrency: Final[int] = max(1, concurrency)
+
+    @property
+    def concurrency(self) -> int:
+        return self.__concurrency
+
+    def crawl(self, root: str) -> dict[str, DirectoryListing | None]:
+        import asyncio  # Deferred because it is slow to import and only needed for concurrent scans
+
+        return asyncio.run(self.__crawl(root))
+
+    @staticmethod
+    def list_directory(directory: str) -> DirectoryListing | None:
+        try:
+            with os.scandir(directory) as it:
+                entries: list[os.DirEntry] = list(it)
+        except OSError:
+            return None
+
+        # Directory order depends on the file system, and only the first transcript of a project is read
+        entries.sort(key=lambda e: e.name)
+
+        transcript_paths: list[str] = [e.path for e in entries if CorpusCrawler.is_transcript(e.name) and e.is_file()]
+
+        # Prefer a plain transcript over a compressed copy of it
+        transcript_path: str | None = next(
+            (path for path in transcript_paths if path.endswith(CorpusCrawler.TRANSCRIPT_EXTENSION)),
+            transcript_paths[0] if len(transcript_paths) > 0 else None)
+
+        # Chapter directories are leaves, so only look for subdirectories when there is no transcript
+        if transcript_path:
+            return transcript_path, []
+
+        return None, [e.path for e in entries if e.is_dir()]
+
+    @staticmethod
+    def is_transcript(filename: str) -> bool:
+        # Also matches compressed transcripts such as `.trans.txt.gz`
+        return CompressionUtil.strip_extension(filename).endswith(CorpusCrawler.TRANSCRIPT_EXTENSION)
+
+    async def __crawl(self, root: str) -> dict[str, DirectoryListing | None]:
+        import asyncio
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        listings: dict[str, DirectoryListing | None] = {}
+        pending: dict[asyncio.Future, str] = {}
+
+        # Keep up to `concurrency` directory listings in flight; each completed listing queues its subdirectories
+        with ThreadPoolExecutor(max_workers=self.__concurrency) as executor:
+            def submit(directory: str) -> None:
+                pending[loop.run_in_executor(executor, CorpusCrawler.list_directory, directory)] = directory
+
+            submit(root)
+
+            while len(pending) > 0:
+                done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+
+                for future in done:
+                    directory: str = pending.pop(future)
+                    listing: DirectoryListing | None = future.result()
+                    listings[directory] = listing
+
+                    if listing is not None:
+                        for subdirectory in listing[1]:
+                            submit(subdirectory)
+
+        return listings
@@ -0,0 +1,140 @@
+﻿import os.path
+import zlib
+from typing import Final, Iterator
+
+from src.kaldi_training_data_formatter import CorpusCrawler, ProjectUtil
+from src.kaldi_training_data_formatter.corpus_crawler import DirectoryListing
+
+
+class CorpusEntry:
+    def __init__(self, directory: str, transcript_path: str, user_id: str | None, project_id: str | None):
+        self.__directory: Final[str] = directory
+        self.__transcript_path: Final[str] = transcript_path
+        self.__user_id: Final[str | None] = user_id
+        self.__project_id: Final[str | None] = project_id
+
+    @property
+    def directory(self) -> str:
+        return self.__directory
+
+    @property
+    def project_id(self) -> str | None:
+        return self.__project_id
+
+    @property
+    def transcript_path(self) -> str:
+        return self.__transcript_path
+
+    @property
+    def user_id(self) -> str | None:
+        return self.__user_id
+
+
+class CorpusIndex:
+    TRANSCRIPT_EXTENSION: Final[str] = CorpusCrawler.TRANSCRIPT_EXTENSION
+
+    def __init__(self, root: str):
+        self.__root: Final[str] = root
+        self.__entries: Final[list[CorpusEntry]] = []
+        self.__directories_visited: int = 0
+
+    @classmethod
+    def from_root(cls, root: str, concurrency: int = 1):
+        index = cls(root)
+        index.scan(concurrency)
+
+        return index
+
+    @property
+    def directories_visited(self) -> int:
+        return self.__directories_visited
+
+    @property
+    def entries(self) -> list[CorpusEntry]:
+        return self.__entries
+
+    @property
+    def project_ids(self) -> set[str]:
+        return {entry.project_id for entry in self.__entries if entry.project_id is not None}
+
+    @property
+    def root(self) -> str:
+        return self.__root
+
+    @property
+    def transcripts(self) -> list[str]:
+        return [entry.transcript_path for entry in self.__entries]
+
+    @property
+    def user_ids(self) -> set[str]:
+        return {entry.user_id for entry in self.__entries if entry.user_id is not None}
+
+    def scan(self, concurrency: int = 1) -> None:
+        self.__entries.clear()
+        self.__directories_visited = 0
+
+        if not os.path.isdir(self.__root):
+            raise Exception(f'Directory does not exist: "{self.__root}"')
+
+        # Crawl concurrently up front, then walk the listings in the same order as a serial scan
+        listings: dict[str, DirectoryListing | None] | None = None
+
+        if concurrency > 1:
+            listings = CorpusCrawler(concurrency).crawl(self.__root)
+
+        directory_queue: list[str] = [self.__root]
+
+        while len(directory_queue) > 0:
+            directory: str = directory_queue.pop()
+            listing: DirectoryListing | None = (listings[directory]
+                                                if listings is not None
+                                                else CorpusCrawler.list_directory(directory))
+
+            if listing is None:
+                print(f'Could not find directory: "{directory}"')
+                continue
+
+            self.__directories_visited += 1
+            transcript_path, subdirectories = listing
+
+            # If no transcript file was found then try adding subdirectories and skip this directory
+            if not transcript_path:
+                directory_queue += reversed(subdirectories)  # Popped from the end, so visited by name
+                continue
+
+            user_id, project_id = ProjectUtil.get_user_and_project_id(directory)
+            self.__entries.append(CorpusEntry(directory, transcript_path, user_id, project_id))
+
+    def shard(self, shard: int, shard_count: int):
+        if shard_count < 1 or not 0 <= shard < shard_count:
+            raise Exception(f'Invalid shard {shard}/{shard_count}')
+
+        index = CorpusIndex(self.__root)
+        index.__entries.extend(entry for entry in self.__entries if CorpusIndex.get_shard(entry, shard_count) == shard)
+
+        return index
+
+    @staticmethod
+    def get_shard(entry: CorpusEntry, shard_count: int) -> int:
+        # Keeps each project whole, since only its first transcript is read; crc32 is stable across machines
+        key: str = f'{entry.user_id}/{entry.project_id}'
+
+        return zlib.crc32(key.encode('utf-8', 'surrogateescape')) % shard_count
+
+    def subset(self, root: str):
+        root = os.path.normpath(root)
+        prefix: str = os.path.join(root, '')
+        index = CorpusIndex(root)
+        index.__entries.extend(
+            entry
+            for entry in self.__entries
+            if os.path.normpath(entry.directory) == root or os.path.normpath(entry.directory).startswith(prefix)
+        )
+
+        return index
+
+    def __iter__(self) -> Iterator[CorpusEntry]:
+        return iter(self.__entries)
+
+    def __len__(self) -> int:
+        return len(self.__entries)
@@ -0,0 +1,150 @@
+﻿import os.path
+import shlex
+from typing import Final, Iterator, Tuple
+
+from src.kaldi_training_data_formatter import (AtomicWriter, AudioMetadataIndex, CorpusEntry, CorpusIndex,
+                                               ExternalSorter, FilesUtil, ProjectUtil, TranscriptReader)
+
+
+class DataDirWriter:
+    TEXT_FILENAME: Final[str] = 'text'
+    WAV_SCP_FILENAME: Final[str] = 'wav.scp'
+    UTT2SPK_FILENAME: Final[str] = 'utt2spk'
+    SPK2UTT_FILENAME: Final[str] = 'spk2utt'
+    UTT2DUR_FILENAME: Final[str] = 'utt2dur'
+
+    # Commands that make Kaldi read each audio format as a WAV stream
+    __WAV_COMMANDS: Final[dict[str, str]] = {
+        '.flac': 'flac -c -d -s {} |',
+        '.mp3': 'sox {} -t wav - |',
+        '.ogg': 'sox {} -t wav - |',
+    }
+
+    def __init__(self,
+                 output_dir: str,
+                 max_lines: int = ExternalSorter.MAX_LINES,
+                 audio_index: AudioMetadataIndex | None = None):
+        self.__output_dir: Final[str] = output_dir
+        self.__max_lines: Final[int] = max_lines
+        self.__audio_index: Final[AudioMetadataIndex | None] = audio_index
+
+    @property
+    def output_dir(self) -> str:
+        return self.__output_dir
+
+    def write(self, index: CorpusIndex) -> int:
+        utterance_count: int = 0
+        missing_duration_count: int = 0
+
+        # Kaldi wants every file sorted on its first field in C-locale (byte) order, which is the same as
+        # Python's code point order for UTF-8 text
+        with ExternalSorter(self.__max_lines, key=DataDirWriter.__first_field) as text, \
+                ExternalSorter(self.__max_lines, key=DataDirWriter.__first_field) as wav_scp, \
+                ExternalSorter(self.__max_lines, key=DataDirWriter.__first_field) as utt2spk, \
+                ExternalSorter(self.__max_lines, key=DataDirWriter.__split_pair) as spk2utt, \
+                ExternalSorter(self.__max_lines, key=DataDirWriter.__first_field) as utt2dur:
+            for entry in index:
+                for utterance_id, speaker_id, words, audio_path in DataDirWriter.__read_utterances(entry):
+                    text.add(f'{utterance_id} {words}')
+                    wav_scp.add(f'{utterance_id} {DataDirWriter.__get_wav_command(audio_path)}')
+                    utt2spk.add(f'{utterance_id} {speaker_id}')
+                    spk2utt.add(f'{speaker_id} {utterance_id}')
+                    utterance_count += 1
+
+                    # Durations come from the headers read into the audio index, never from the samples
+                    if self.__audio_index is not None:
+                        duration: float | None = self.__audio_index.get_duration(audio_path)
+
+                        if duration is not None:
+                            utt2dur.add(f'{utterance_id} {duration:.3f}')
+                        else:
+                            missing_duration_count += 1
+
+            os.makedirs(self.__output_dir, exist_ok=True)
+            self.__write_file(DataDirWriter.TEXT_FILENAME, text.sorted_lines())
+            self.__write_file(DataDirWriter.WAV_SCP_FILENAME, wav_scp.sorted_lines())
+            self.__write_file(DataDirWriter.UTT2SPK_FILENAME, utt2spk.sorted_lines())
+            self.__write_file(DataDirWriter.SPK2UTT_FILENAME, DataDirWriter.__group_speakers(spk2utt.sorted_lines()))
+
+            # Kaldi wants utt2dur to list the same utterances as utt2spk, so a partial file is worse than none
+            if self.__audio_index is not None and missing_duration_count == 0:
+                self.__write_file(DataDirWriter.UTT2DUR_FILENAME, utt2dur.sorted_lines())
+            else:
+                if self.__audio_index is not None:
+                    print(f'Could not read the duration of {missing_duration_count} of {utterance_count} utterances, '
+                          f'skipping {DataDirWriter.UTT2DUR_FILENAME}')
+
+                utt2dur_path: str = os.path.join(self.__output_dir, DataDirWriter.UTT2DUR_FILENAME)
+
+                if os.path.isfile(utt2dur_path):
+                    os.remove(utt2dur_path)
+
+        return utterance_count
+
+    def __write_file(self, filename: str, lines: Iterator[str]) -> None:
+        with AtomicWriter(os.path.join(self.__output_dir, filename), encoding='utf-8') as writer:
+            writer.write_lines(lines)
+
+    @staticmethod
+    def __first_field(line: str) -> str:
+        return line.partition(' ')[0]
+
+    @staticmethod
+    def __get_wav_command(audio_path: str) -> str:
+        extension: str = os.path.splitext(audio_path)[1].lower()
+        command: str | None = DataDirWriter.__WAV_COMMANDS.get(extension)
+
+        if command:
+            return command.format(shlex.quote(audio_path))
+
+        # Kaldi splits wav.scp on whitespace, so such paths are only readable through a pipe
+        if any(c.isspace() for c in audio_path):
+            return f'cat {shlex.quote(audio_path)} |'
+
+        return audio_path
+
+    @staticmethod
+    def __group_speakers(pairs: Iterator[str]) -> Iterator[str]:
+        current_speaker: str | None = None
+        utterances: list[str] = []
+
+        for pair in pairs:
+            speaker_id, utterance_id = DataDirWriter.__split_pair(pair)
+
+            if speaker_id != current_speaker and current_speaker is not None:
+                yield ' '.join([current_speaker] + utterances)
+                utterances.clear()
+
+            current_speaker = speaker_id
+            utterances.append(utterance_id)
+
+        if current_speaker is not None:
+            yield ' '.join([current_speaker] + utterances)
+
+    @staticmethod
+    def __read_utterances(entry: CorpusEntry) -> Iterator[Tuple[str, str, str, str]]:
+        if entry.user_id is None:
+            print(f'Could not find speaker for transcript: "{entry.transcript_path}"')
+            return
+
+        chapter_id: str = os.path.basename(entry.directory)
+        audio_files: dict[str, str] = FilesUtil.get_audio_files(entry.directory)
+
+        with TranscriptReader(entry.transcript_path) as reader:
+            for line in reader:
+                utterance_id: str = ProjectUtil.get_utterance_id(entry.user_id, chapter_id, line.id)
+                audio_path: str | None = (audio_files.get(utterance_id)
+                                          or audio_files.get(line.id)
+                                          or audio_files.get(line.id.strip('[]')))
+
+                if audio_path is None:
+                    print(f'Could not find audio for utterance "{line.id}" in: "{entry.directory}"')
+                    continue
+
+                yield utterance_id, entry.user_id, ' '.join(line.text).lower(), os.path.abspath(audio_path)
+
+    @staticmethod
+    def __split_pair(line: str) -> Tuple[str, str]:
+        first, _, second = line.partition(' ')
+
+        return first, second
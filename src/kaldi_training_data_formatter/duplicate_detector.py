@@ -0,0 +1,89 @@
+﻿import os.path
+from typing import Final, Iterator, Tuple
+
+from src.kaldi_training_data_formatter import BloomFilter, CorpusIndex, ProjectUtil, TranscriptReader
+
+# Transcript path and line number of an utterance
+Location = Tuple[str, int]
+
+
+class DuplicateDetector:
+    # Above this many estimated lines the exact set of every ID is replaced by a Bloom filter pre-pass
+    BLOOM_FILTER_THRESHOLD: Final[int] = 10_000_000
+
+    # Shortest plausible transcript line, used to estimate the number of lines from file sizes
+    __MIN_LINE_BYTES: Final[int] = 16
+
+    def __init__(self, bloom_filter_threshold: int = BLOOM_FILTER_THRESHOLD, error_rate: float = 0.001):
+        self.__bloom_filter_threshold: Final[int] = bloom_filter_threshold
+        self.__error_rate: Final[float] = error_rate
+
+    def find_duplicates(self, index: CorpusIndex) -> dict[str, list[Location]]:
+        total_size: int = sum(os.path.getsize(entry.transcript_path) for entry in index)
+        estimated_count: int = total_size // DuplicateDetector.__MIN_LINE_BYTES
+
+        if estimated_count < self.__bloom_filter_threshold:
+            return DuplicateDetector.__find_exact(index)
+
+        return self.__find_with_bloom_filter(index, estimated_count)
+
+    @staticmethod
+    def format_duplicates(duplicates: dict[str, list[Location]]) -> Iterator[str]:
+        for utterance_id, locations in sorted(duplicates.items()):
+            yield f'Duplicate utterance ID "{utterance_id}":'
+
+            for path, line_number in locations:
+                yield f'  line {line_number} in: "{path}"'
+
+    @staticmethod
+    def __find_exact(index: CorpusIndex) -> dict[str, list[Location]]:
+        first_locations: dict[str, Location] = {}
+        duplicates: dict[str, list[Location]] = {}
+
+        for utterance_id, location in DuplicateDetector.__read_utterance_ids(index):
+            first_location: Location | None = first_locations.setdefault(utterance_id, location)
+
+            if first_location is location:
+                continue  # First time this ID is seen
+
+            if utterance_id in duplicates:
+                duplicates[utterance_id].append(location)
+            else:
+                duplicates[utterance_id] = [first_location, location]
+
+        return duplicates
+
+    def __find_with_bloom_filter(self, index: CorpusIndex, estimated_count: int) -> dict[str, list[Location]]:
+        bloom_filter: BloomFilter = BloomFilter(estimated_count, self.__error_rate)
+        candidates: set[str] = set()
+
+        # The first pass only keeps IDs that may have been seen before, which includes every real duplicate
+        for utterance_id, _ in DuplicateDetector.__read_utterance_ids(index):
+            if bloom_filter.add(utterance_id):
+                candidates.add(utterance_id)
+
+        if len(candidates) == 0:
+            return {}
+
+        # The second pass records where the candidates are, then drops the false positives
+        locations: dict[str, list[Location]] = {}
+
+        for utterance_id, location in DuplicateDetector.__read_utterance_ids(index):
+            if utterance_id in candidates:
+                locations.setdefault(utterance_id, []).append(location)
+
+        return {utterance_id: found for utterance_id, found in locations.items() if len(found) > 1}
+
+    @staticmethod
+    def __read_utterance_ids(index: CorpusIndex) -> Iterator[Tuple[str, Location]]:
+        for entry in index:
+            if entry.user_id is None:
+                continue
+
+            chapter_id: str = os.path.basename(entry.directory)
+
+            with TranscriptReader(entry.transcript_path) as reader:
+                for line_number, line in reader.iter_numbered():
+                    utterance_id: str = ProjectUtil.get_utterance_id(entry.user_id, chapter_id, line.id)
+
+                    yield utterance_id, (entry.transcript_path, line_number)
@@ -0,0 +1,107 @@
+﻿import heapq
+import os
+import tempfile
+from enum import Enum
+from io import TextIOWrapper
+from typing import Any, Callable, Final, Iterator
+
+
+class SortOrder(Enum):
+    # Python string order, by code point
+    CodePoint = 0
+
+    # `LC_ALL=C sort` order, by UTF-8 byte; only differs from code point order for surrogate escaped text
+    CLocale = 1
+
+
+class ExternalSorter:
+    MAX_LINES: Final[int] = 1_000_000
+
+    def __init__(self,
+                 max_lines: int | None = MAX_LINES,
+                 key: Callable[[str], Any] | None = None,
+                 temp_dir: str | None = None,
+                 order: SortOrder = SortOrder.CodePoint):
+        self.__max_lines: Final[int | None] = max(1, max_lines) if max_lines is not None else None
+        self.__key: Final[Callable[[str], Any] | None] = ExternalSorter.create_key(key, order)
+        self.__temp_dir: Final[str | None] = temp_dir
+        self.__lines: list[str] = []
+        self.__run_paths: Final[list[str]] = []
+        self.__run_files: Final[list[TextIOWrapper]] = []
+
+    @property
+    def run_count(self) -> int:
+        return len(self.__run_paths)
+
+    @staticmethod
+    def create_key(key: Callable[[str], Any] | None, order: SortOrder) -> Callable[[str], Any] | None:
+        match order:
+            case SortOrder.CodePoint:
+                return key
+
+            case SortOrder.CLocale:
+                if key is None:
+                    return ExternalSorter.__to_bytes
+
+                return lambda line: ExternalSorter.__to_bytes(key(line))
+
+            case _:
+                raise Exception(f'Invalid sort order {order}')
+
+    def add(self, line: str) -> None:
+        self.__lines.append(line)
+
+        if self.__max_lines is not None and len(self.__lines) >= self.__max_lines:
+            self.__spill()
+
+    def sorted_lines(self) -> Iterator[str]:
+        # Stay in memory when everything fit into a single run
+        if len(self.__run_paths) == 0:
+            self.__lines.sort(key=self.__key)
+            yield from self.__lines
+            return
+
+        if len(self.__lines) > 0:
+            self.__spill()
+
+        for path in self.__run_paths:
+            self.__run_files.append(open(path, mode='r', encoding='utf-8', errors='surrogateescape', newline='\n'))
+
+        runs: list[Iterator[str]] = [(line[:-1] for line in f) for f in self.__run_files]
+
+        yield from heapq.merge(*runs, key=self.__key)
+
+    @staticmethod
+    def __to_bytes(value: Any) -> Any:
+        if isinstance(value, str):
+            return value.encode('utf-8', 'surrogateescape')
+
+        if isinstance(value, tuple):
+            return tuple(ExternalSorter.__to_bytes(v) for v in value)
+
+        return value
+
+    def __spill(self) -> None:
+        self.__lines.sort(key=self.__key)
+        fd, path = tempfile.mkstemp(prefix='ktdf-sort-', suffix='.txt', dir=self.__temp_dir)
+        self.__run_paths.append(path)
+
+        with open(fd, mode='w', encoding='utf-8', errors='surrogateescape', newline='\n') as f:
+            f.writelines(line + '\n' for line in self.__lines)
+
+        self.__lines = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        for f in self.__run_files:
+            f.close()
+
+        for path in self.__run_paths:
+            if os.path.isfile(path):
+                os.remove(path)
+
+        self.__run_files.clear()
+        self.__run_paths.clear()
+        self.__lines = []
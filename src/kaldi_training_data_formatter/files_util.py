@@ -1,85 +1,139 @@
 ﻿import os.path
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from typing import Final, Tuple
 
-from src.kaldi_training_data_formatter import TranscriptLine, TranscriptReader, ProjectUtil
+from src.kaldi_training_data_formatter import CorpusEntry, CorpusIndex, TranscriptLine, TranscriptReader, ProjectUtil
 
 
 class FilesUtil:
-    __EXTENSION: Final[str] = '.trans.txt'
+    AUDIO_EXTENSIONS: Final[frozenset[str]] = frozenset({'.flac', '.mp3', '.ogg', '.wav'})
 
     class __FormatType(Enum):
         Audio = 0
         Transcript = 1
 
     @staticmethod
-    def format_audio_files(root: str) -> None:
-        FilesUtil.__format_files(root, FilesUtil.__FormatType.Audio)
+    def format_audio_files(root: str,
+                           index: CorpusIndex | None = None,
+                           jobs: int = 1,
+                           dry_run: bool = False) -> list[Tuple[str, str]]:
+        return FilesUtil.__format_files(root, FilesUtil.__FormatType.Audio, index, jobs, dry_run)
 
     @staticmethod
-    def __format_audio_files_for_transcript(transcript_path: str) -> None:
-        directory: str = os.path.dirname(transcript_path)
-        print(directory)
+    def find_audio_files(index: CorpusIndex, jobs: int = 1) -> list[str]:
+        # Each listing is a file system round trip, so list the chapters on a thread pool
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            listings = executor.map(lambda entry: FilesUtil.get_audio_files(entry.directory), index)
 
-        if not directory:
-            print("Transcript directory is not valid")
-            return
+            return [path for audio_files in listings for path in audio_files.values()]
 
-        user_id, project_id = ProjectUtil.get_user_and_project_id(directory)
-        print('; '.join([user_id, project_id]))
+    @staticmethod
+    def get_audio_files(directory: str) -> dict[str, str]:
+        audio_files: dict[str, str] = {}
+
+        with os.scandir(directory) as it:
+            for entry in it:
+                stem, extension = os.path.splitext(entry.name)
+
+                if extension.lower() in FilesUtil.AUDIO_EXTENSIONS and entry.is_file():
+                    audio_files[stem] = entry.path
 
-        # lines: dict[str, TranscriptLine] = FilesUtil.__get_transcript_lines(transcript_path)
+        return audio_files
 
     @staticmethod
-    def __format_files(root: str, format_type: __FormatType) -> None:
-        if not os.path.isdir(root):
-            return
+    def __format_audio_files_for_transcript(entry: CorpusEntry, dry_run: bool) -> list[Tuple[str, str]]:
+        if entry.user_id is None:
+            print(f'Could not find speaker for transcript: "{entry.transcript_path}"')
+            return []
+
+        chapter_id: str = os.path.basename(entry.directory)
+
+        try:
+            lines: dict[str, TranscriptLine] = FilesUtil.__get_transcript_lines(entry.transcript_path)
+            audio_files: dict[str, str] = FilesUtil.get_audio_files(entry.directory)
+        except OSError as e:
+            print(f'Error while reading audio files in "{entry.directory}": ' + str(e))
+            return []
 
-        directories_queue = [root]
+        renames: list[Tuple[str, str]] = []
 
-        while len(directories_queue) > 0:
-            directory = directories_queue.pop()
-            directories_queue += [f.path for f in os.scandir(directory) if f.is_dir()]
+        # Plan every rename in the directory before touching any file
+        for line_id in lines.keys():
+            utterance_id: str = ProjectUtil.get_utterance_id(entry.user_id, chapter_id, line_id)
 
-            (has_transcript, transcript_path) = FilesUtil.__has_transcript_file(directory)
+            if utterance_id in audio_files:
+                continue  # Already formatted
 
-            if not has_transcript:
+            source: str | None = audio_files.get(line_id) or audio_files.get(line_id.strip('[]'))
+
+            if source is None:
+                print(f'Could not find audio for utterance "{line_id}" in: "{entry.directory}"')
                 continue
 
-            match format_type:
-                case FilesUtil.__FormatType.Audio:
-                    break
+            target: str = os.path.join(entry.directory, utterance_id + os.path.splitext(source)[1])
+            renames.append((source, target))
+
+        if dry_run:
+            for source, target in renames:
+                print(f'Would rename "{source}" to "{target}"')
+
+            return renames
 
-                case FilesUtil.__FormatType.Transcript:
-                    break
+        completed: list[Tuple[str, str]] = []
 
-                case _:
-                    raise Exception(f'Invalid format type {format_type}')
+        # Stop at the first failure so the other directories still get formatted and every rename done is reported
+        for source, target in renames:
+            try:
+                os.rename(source, target)
+            except OSError as e:
+                print(f'Error while renaming audio files in "{entry.directory}": ' + str(e))
+                break
+
+            completed.append((source, target))
+
+        return completed
+
+    @staticmethod
+    def __format_files(root: str,
+                       format_type: __FormatType,
+                       index: CorpusIndex | None,
+                       jobs: int,
+                       dry_run: bool) -> list[Tuple[str, str]]:
+        if not os.path.isdir(root):
+            return []
+
+        entries: CorpusIndex = index.subset(root) if index is not None else CorpusIndex.from_root(root)
+
+        match format_type:
+            case FilesUtil.__FormatType.Audio:
+                format_directory = FilesUtil.__format_audio_files_for_transcript
+
+            case FilesUtil.__FormatType.Transcript:
+                return []  # Transcripts are not reformatted yet
+
+            case _:
+                raise Exception(f'Invalid format type {format_type}')
+
+        # Directories are independent and the work is I/O bound, so format them on a thread pool
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            results = executor.map(lambda e: format_directory(e, dry_run), entries)
+
+            return [operation for operations in results for operation in operations]
 
     @staticmethod
     def __get_transcript_lines(transcript_path: str) -> dict[str, TranscriptLine]:
-        lines = {}
+        lines: dict[str, TranscriptLine] = {}
+        line_numbers: dict[str, int] = {}
 
         with TranscriptReader(transcript_path) as reader:
-            line: TranscriptLine
-
-            while line := reader.read_transcript_line():
-                if line.id in lines.keys():
-                    pass  # TODO: Handle duplicate IDs.
+            for line_number, line in reader.iter_numbered():
+                if line.id in lines:
+                    # Keep the first line; duplicates across the corpus are reported by --check-duplicates
+                    print(f'Duplicate utterance ID "{line.id}" on line {line_number} '
+                          f'(first on line {line_numbers[line.id]}) in: "{transcript_path}"')
                 else:
                     lines[line.id] = line
+                    line_numbers[line.id] = line_number
 
         return lines
-
-    @staticmethod
-    def __has_transcript_file(directory: str) -> Tuple[bool, str | None]:
-        files: list[str] = [
-            f.path
-            for f in os.scandir(directory)
-            if f.is_file() and f.path.endswith(FilesUtil.__EXTENSION)
-        ]
-
-        if len(files) > 0:
-            return True, files[0]
-        else:
-            return False, None
@@ -0,0 +1,160 @@
+﻿import json
+import os
+import time
+from typing import Any, Final
+
+from src.kaldi_training_data_formatter import AtomicWriter, StageProfiler
+
+
+class StageMetrics:
+    __slots__ = ('__name', '__profiler', '__wall_time', '__cpu_time', '__counters', '__start_wall', '__start_cpu')
+
+    def __init__(self, name: str, profiler: StageProfiler | None = None):
+        self.__name: Final[str] = name
+        self.__profiler: Final[StageProfiler | None] = profiler
+        self.__wall_time: float = 0.0
+        self.__cpu_time: float = 0.0
+        self.__counters: Final[dict[str, int]] = {}
+        self.__start_wall: float = 0.0
+        self.__start_cpu: float = 0.0
+
+    @property
+    def counters(self) -> dict[str, int]:
+        return self.__counters
+
+    @property
+    def cpu_time(self) -> float:
+        return self.__cpu_time
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def wall_time(self) -> float:
+        return self.__wall_time
+
+    def add(self, counter: str, value: int = 1) -> None:
+        self.__counters[counter] = self.__counters.get(counter, 0) + value
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'stage': self.__name,
+            'wall_seconds': self.__wall_time,
+            'cpu_seconds': self.__cpu_time,
+            'counters': dict(self.__counters),
+        }
+
+    @staticmethod
+    def __get_cpu_time() -> float:
+        # Include worker processes that have been waited on so process pools are not missed
+        times: os.times_result = os.times()
+
+        return times.user + times.system + times.children_user + times.children_system
+
+    def __enter__(self):
+        if self.__profiler is not None:
+            self.__profiler.start(self.__name)
+
+        self.__start_wall = time.perf_counter()
+        self.__start_cpu = StageMetrics.__get_cpu_time()
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.__wall_time += time.perf_counter() - self.__start_wall
+        self.__cpu_time += StageMetrics.__get_cpu_time() - self.__start_cpu
+
+        if self.__profiler is not None:
+            self.__profiler.stop(self.__name)
+
+
+class NullStage:
+    __slots__ = ()
+
+    def add(self, counter: str, value: int = 1) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class Instrumentation:
+    PROMETHEUS_PREFIX: Final[str] = 'ktdf'
+
+    # Shared by every disabled instance so stages cost a method call and nothing else
+    __NULL_STAGE: Final[NullStage] = NullStage()
+
+    def __init__(self, enabled: bool = True, profiler: StageProfiler | None = None):
+        # Profiles are labeled by stage, so profiling needs the stages to be recorded
+        self.__enabled: Final[bool] = enabled or profiler is not None
+        self.__profiler: Final[StageProfiler | None] = profiler
+        self.__stages: Final[dict[str, StageMetrics]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    @property
+    def profiler(self) -> StageProfiler | None:
+        return self.__profiler
+
+    @property
+    def stages(self) -> list[StageMetrics]:
+        return list(self.__stages.values())
+
+    def stage(self, name: str) -> StageMetrics | NullStage:
+        if not self.__enabled:
+            return Instrumentation.__NULL_STAGE
+
+        # Re-entering a stage accumulates into the same metrics
+        metrics: StageMetrics | None = self.__stages.get(name)
+
+        if metrics is None:
+            metrics = StageMetrics(name, self.__profiler)
+            self.__stages[name] = metrics
+
+        return metrics
+
+    def format_summary(self) -> str:
+        lines: list[str] = [f'{"stage":<20} {"wall (s)":>10} {"cpu (s)":>10}  counters']
+
+        for metrics in self.__stages.values():
+            counters: str = ', '.join(f'{key}={value}' for key, value in sorted(metrics.counters.items()))
+            lines.append(f'{metrics.name:<20} {metrics.wall_time:>10.3f} {metrics.cpu_time:>10.3f}  {counters}')
+
+        return '\n'.join(lines)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {'stages': [metrics.to_dict() for metrics in self.__stages.values()]}
+
+    def write_json(self, path: str) -> None:
+        with AtomicWriter(path, encoding='utf-8') as writer:
+            writer.write(json.dumps(self.to_dict(), indent=2))
+            writer.write('\n')
+
+    def write_prometheus(self, path: str) -> None:
+        # Text file format read by the node exporter's textfile collector
+        prefix: str = Instrumentation.PROMETHEUS_PREFIX
+        lines: list[str] = []
+        counter_names: list[str] = sorted({key for metrics in self.__stages.values() for key in metrics.counters})
+
+        lines.append(f'# HELP {prefix}_stage_wall_seconds Wall time spent in each pipeline stage.')
+        lines.append(f'# TYPE {prefix}_stage_wall_seconds gauge')
+        lines += [f'{prefix}_stage_wall_seconds{{stage="{m.name}"}} {m.wall_time}' for m in self.__stages.values()]
+
+        lines.append(f'# HELP {prefix}_stage_cpu_seconds CPU time spent in each pipeline stage.')
+        lines.append(f'# TYPE {prefix}_stage_cpu_seconds gauge')
+        lines += [f'{prefix}_stage_cpu_seconds{{stage="{m.name}"}} {m.cpu_time}' for m in self.__stages.values()]
+
+        for counter in counter_names:
+            lines.append(f'# TYPE {prefix}_stage_{counter} gauge')
+            lines += [f'{prefix}_stage_{counter}{{stage="{m.name}"}} {m.counters[counter]}'
+                      for m in self.__stages.values()
+                      if counter in m.counters]
+
+        with AtomicWriter(path, encoding='utf-8') as writer:
+            writer.write_lines(lines)
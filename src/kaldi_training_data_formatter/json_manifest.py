@@ -0,0 +1,43 @@
+﻿import json
+import os.path
+from typing import Any, Final
+
+from src.kaldi_training_data_formatter import AtomicWriter
+
+
+class JsonManifest:
+    def __init__(self, path: str, version: int):
+        self.__path: Final[str] = path
+        self.__version: Final[int] = version
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    @property
+    def version(self) -> int:
+        return self.__version
+
+    def load(self) -> dict[str, Any]:
+        if not os.path.isfile(self.__path):
+            return {}
+
+        with open(self.__path, mode='r', encoding='utf-8') as f:
+            manifest: dict[str, Any] = json.load(f)
+
+        # Discard manifests written in another format
+        if manifest.get('version') != self.__version:
+            return {}
+
+        return manifest['files']
+
+    def save(self, files: dict[str, Any]) -> None:
+        manifest: dict[str, Any] = {
+            'version': self.__version,
+            'files': files,
+        }
+
+        os.makedirs(os.path.dirname(self.__path), exist_ok=True)
+
+        with AtomicWriter(self.__path, encoding='utf-8') as writer:
+            writer.write(json.dumps(manifest, separators=(',', ':')))
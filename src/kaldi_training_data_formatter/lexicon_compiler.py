@@ -1,109 +1,166 @@
 ﻿import os.path
-from typing import Final, Collection
+from typing import Final, Collection, Iterable, Iterator, Tuple
+
+from src.kaldi_training_data_formatter import (AtomicWriter, ExternalSorter, LexiconIndex, LexiconReader, PhoneLexicon,
+                                               SortOrder)
 
 
 class LexiconCompiler:
     LEXICON_FILENAME: Final[str] = 'lexicon.txt'
-
-    def __init__(self, input_root: str, output_root: str, use_existing: bool = False, import_name: str | None = None):
+    NO_PHONES: Final[str] = '<<<<<!!! NO PHONES !!!>>>>>'
+
+    def __init__(self,
+                 input_root: str,
+                 output_root: str,
+                 use_existing: bool = False,
+                 import_name: str | None = None,
+                 max_sort_lines: int | None = None,
+                 sort_order: SortOrder = SortOrder.CodePoint):
         self.__input_root: Final[str] = input_root
         self.__output_root: Final[str] = output_root
         self.__use_existing: Final[bool] = use_existing
         self.__import_name: Final[str | None] = import_name
-        self.__lexicon: Final[dict[str, set[str]]] = {}
+        self.__max_sort_lines: Final[int | None] = max_sort_lines
+        self.__sort_order: Final[SortOrder] = sort_order
+        self.__lexicon: Final[PhoneLexicon] = PhoneLexicon()
+        self.__bytes_read: int = 0
+        self.__bytes_written: int = 0
+        self.__lines_written: int = 0
 
     @classmethod
-    def from_root(cls, root: str, use_existing: bool = False, import_name: str | None = None):
-        return cls(root, root, use_existing, import_name)
+    def from_root(cls,
+                  root: str,
+                  use_existing: bool = False,
+                  import_name: str | None = None,
+                  max_sort_lines: int | None = None,
+                  sort_order: SortOrder = SortOrder.CodePoint):
+        return cls(root, root, use_existing, import_name, max_sort_lines, sort_order)
+
+    @property
+    def bytes_read(self) -> int:
+        return self.__bytes_read
+
+    @property
+    def bytes_written(self) -> int:
+        return self.__bytes_written
 
     @property
     def import_lexicon_name(self) -> str | None:
         return self.__import_name
 
     @property
-    def lexicon(self) -> dict[str, set[str]]:
+    def lexicon(self) -> PhoneLexicon:
         return self.__lexicon
 
+    @property
+    def lines_written(self) -> int:
+        return self.__lines_written
+
     def compile_lexicon(self, vocabulary: Collection[str]) -> None:
-        temp_lexicon: dict[str, set[str]] = {}
         self.__lexicon.clear()
+        self.__bytes_read = 0
+
+        # Filter entries while reading so memory is bounded by the vocabulary and not the lexicons
+        vocabulary_set: Collection[str] = vocabulary if isinstance(vocabulary, (set, frozenset)) else set(vocabulary)
 
         # Read from imported lexicon
         if self.import_lexicon_name:
             path: str = os.path.join(self.__input_root, self.import_lexicon_name)
-            LexiconCompiler.__read_lexicon(path, temp_lexicon)
+
+            self.__bytes_read += LexiconCompiler.__get_size(path)
+
+            if LexiconIndex.is_index(path):
+                LexiconCompiler.__read_lexicon_index(path, self.__lexicon, vocabulary_set)
+            else:
+                LexiconCompiler.__read_lexicon(path, self.__lexicon, vocabulary_set)
 
         # Read from existing lexicon
         if self.__use_existing:
             path: str = os.path.join(self.__input_root, LexiconCompiler.LEXICON_FILENAME)
-            LexiconCompiler.__read_lexicon(path, temp_lexicon)
+            self.__bytes_read += LexiconCompiler.__get_size(path)
+            LexiconCompiler.__read_lexicon(path, self.__lexicon, vocabulary_set)
 
         # Read vocabulary
-        for vocab in vocabulary:
-            # Only keep entries that appear in vocabulary
-            self.__lexicon[vocab] = temp_lexicon[vocab] if vocab in temp_lexicon else set()
-
-    def save_lexicon(self) -> None:
-        words: list[str] = []
-        words += self.__lexicon.keys()
-        words.sort()
+        for vocab in vocabulary_set:
+            # Keep vocabulary that has no phones so it is still written to the lexicon
+            self.__lexicon.add_word(vocab)
 
-        filepath: str = os.path.join(self.__output_root, LexiconCompiler.LEXICON_FILENAME)
+    def save_lexicon(self, filename: str = LEXICON_FILENAME) -> None:
+        filepath: str = os.path.join(self.__output_root, filename)
+        self.__lines_written = 0
 
         try:
             os.makedirs(self.__output_root, exist_ok=True)
 
-            with open(filepath, mode='w', encoding='utf-8') as f:  # Never write lexicon with BOM
-                for word in words:
-                    phones: list[str] = []
-                    phones += self.__lexicon[word]
-                    phones.sort()
-
-                    if len(phones) > 0:
-                        for phone in phones:
-                            f.write(word)
-                            f.write(' ')
-                            f.write(phone)
-                            f.write('\n')
-                    else:
-                        f.write(word)
-                        f.write(' ')
-                        f.write('<<<<<!!! NO PHONES !!!>>>>>')
-                        f.write('\n')
+            with AtomicWriter(filepath, encoding='utf-8') as writer:  # Never write lexicon with BOM
+                if self.__max_sort_lines is None and self.__sort_order == SortOrder.CodePoint:
+                    words: list[str] = []
+                    words += self.__lexicon.keys()
+                    words.sort()
+
+                    writer.write_lines(self.__format_lines(words))
+                else:
+                    # Sort whole lines on (word, phones) so runs can be spilled to disk and merged
+                    with ExternalSorter(self.__max_sort_lines,
+                                        key=LexiconCompiler.__split_line,
+                                        order=self.__sort_order) as sorter:
+                        for line in self.__format_lines(self.__lexicon.keys()):
+                            sorter.add(line)
+
+                        writer.write_lines(sorter.sorted_lines())
+
+            self.__bytes_written = os.path.getsize(filepath)
         except Exception as e:
             print('Error while saving lexicon file: ' + str(e))
 
+    def __format_lines(self, words: Iterable[str]) -> Iterator[str]:
+        for word in words:
+            self.__lines_written += 1
+            pronunciations: Tuple[Tuple[int, ...], ...] = self.__lexicon.get_pronunciations(word)
+
+            # Only sort the phones of words that have more than one pronunciation
+            if len(pronunciations) == 1:
+                yield f'{word} {self.__lexicon.decode(pronunciations[0])}'
+            elif len(pronunciations) > 1:
+                self.__lines_written += len(pronunciations) - 1
+
+                for phones in sorted(self.__lexicon[word]):
+                    yield f'{word} {phones}'
+            else:
+                yield f'{word} {LexiconCompiler.NO_PHONES}'
+
+    @staticmethod
+    def __get_size(path: str) -> int:
+        return os.path.getsize(path) if os.path.isfile(path) else 0
+
+    @staticmethod
+    def __split_line(line: str) -> Tuple[str, str]:
+        word, _, phones = line.partition(' ')
+
+        return word, phones
+
     @staticmethod
-    def __read_lexicon(path: str, write_lexicon: dict[str, set[str]]) -> None:
+    def __read_lexicon(path: str, write_lexicon: PhoneLexicon, vocabulary: Collection[str] | None) -> None:
         if not os.path.isfile(path):
             return
 
         try:
-            with open(path, mode='r', encoding='utf-8-sig') as f:
-                line_num: int = 0
-
-                while line := f.readline():
-                    elements: list[str] = [
-                        el
-                        for el in [token.strip('\n\r ') for token in line.replace('\t', ' ').split(' ')]
-                        if len(el) > 0
-                    ]
-                    line_num += 1
-
-                    if len(elements) < 2:
-                        print(f'Too few elements on line {line_num} in lexicon: "{path}"')
-                        continue
+            with LexiconReader(path) as reader:
+                reader.read_lexicon(write_lexicon, vocabulary)
+        except Exception as e:
+            print('Error while reading lexicon file: ' + str(e))
 
-                    word: str = elements[0].lower()
-                    phones: str = ' '.join(elements[1:]).upper()
-                    existing_phones: set[str]
+    @staticmethod
+    def __read_lexicon_index(path: str, write_lexicon: PhoneLexicon, vocabulary: Collection[str]) -> None:
+        try:
+            with LexiconIndex(path) as index:
+                for word in vocabulary:
+                    phones: set[str] | None = index.lookup(word)
 
-                    if word in write_lexicon:
-                        existing_phones = write_lexicon[word]
-                    else:
-                        existing_phones = set()
-                        write_lexicon[word] = existing_phones
+                    if phones is None:
+                        continue
 
-                    existing_phones.add(phones)
+                    for phone in phones:
+                        write_lexicon.add(word, phone.split(' '))
         except Exception as e:
-            print('Error while reading lexicon file: ' + str(e))
+            print('Error while reading lexicon index: ' + str(e))
@@ -0,0 +1,162 @@
+﻿import mmap
+import os.path
+import struct
+import sys
+from array import array
+from typing import Final, BinaryIO
+
+from src.kaldi_training_data_formatter import LexiconReader, PhoneLexicon
+
+
+class LexiconIndex:
+    MAGIC: Final[bytes] = b'KTDFLEX\x00'
+    __VERSION: Final[int] = 1
+
+    # magic, version, word count, pronunciation count, reference count
+    __HEADER: Final[struct.Struct] = struct.Struct('<8sIIII')
+    __OFFSET: Final[struct.Struct] = struct.Struct('<Q')
+    __REF: Final[struct.Struct] = struct.Struct('<I')
+
+    def __init__(self, path: str):
+        if not os.path.isfile(path):
+            raise Exception(f'path is not a file: "{path}"')
+
+        self.__path: Final[str] = path
+        self.__file: BinaryIO | None = None
+        self.__map: mmap.mmap | None = None
+
+        # Section positions, filled in once the file is mapped
+        self.__word_count: int = 0
+        self.__word_offsets: int = 0
+        self.__word_refs: int = 0
+        self.__refs: int = 0
+        self.__pron_offsets: int = 0
+        self.__words: int = 0
+        self.__prons: int = 0
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    @staticmethod
+    def compile(source_path: str, output_path: str) -> int:
+        lexicon: PhoneLexicon = PhoneLexicon()
+
+        with LexiconReader(source_path) as reader:
+            reader.read_lexicon(lexicon)
+
+        # Words are sorted on their encoded bytes so lookups can binary search the raw file
+        words: list[bytes] = sorted(word.encode('utf-8') for word in lexicon.keys())
+        prons: list[str] = sorted({pron for word_prons in lexicon.values() for pron in word_prons})
+        pron_ids: dict[str, int] = {pron: i for i, pron in enumerate(prons)}
+
+        word_offsets: array = array('Q', [0])
+        word_refs: array = array('I', [0])
+        refs: array = array('I')
+
+        for word in words:
+            word_offsets.append(word_offsets[-1] + len(word))
+            refs.extend(pron_ids[pron] for pron in sorted(lexicon[word.decode('utf-8')]))
+            word_refs.append(len(refs))
+
+        encoded_prons: list[bytes] = [pron.encode('utf-8') for pron in prons]
+        pron_offsets: array = array('Q', [0])
+
+        for pron in encoded_prons:
+            pron_offsets.append(pron_offsets[-1] + len(pron))
+
+        if sys.byteorder != 'little':
+            for section in (word_offsets, word_refs, refs, pron_offsets):
+                section.byteswap()
+
+        with open(output_path, mode='wb') as f:
+            f.write(LexiconIndex.__HEADER.pack(LexiconIndex.MAGIC,
+                                               LexiconIndex.__VERSION,
+                                               len(words),
+                                               len(prons),
+                                               len(refs)))
+            f.write(word_offsets.tobytes())
+            f.write(word_refs.tobytes())
+            f.write(refs.tobytes())
+            f.write(pron_offsets.tobytes())
+            f.write(b''.join(words))
+            f.write(b''.join(encoded_prons))
+
+        return len(words)
+
+    @staticmethod
+    def is_index(path: str) -> bool:
+        if not os.path.isfile(path):
+            return False
+
+        with open(path, mode='rb') as f:
+            return f.read(len(LexiconIndex.MAGIC)) == LexiconIndex.MAGIC
+
+    def lookup(self, word: str) -> set[str] | None:
+        key: bytes = word.encode('utf-8')
+        low: int = 0
+        high: int = self.__word_count
+
+        while low < high:
+            middle: int = (low + high) // 2
+
+            if self.__get_word(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low >= self.__word_count or self.__get_word(low) != key:
+            return None
+
+        start: int = LexiconIndex.__REF.unpack_from(self.__map, self.__word_refs + low * 4)[0]
+        end: int = LexiconIndex.__REF.unpack_from(self.__map, self.__word_refs + (low + 1) * 4)[0]
+
+        return {
+            self.__get_pron(LexiconIndex.__REF.unpack_from(self.__map, self.__refs + i * 4)[0])
+            for i in range(start, end)
+        }
+
+    def __get_pron(self, pron_id: int) -> str:
+        start: int = LexiconIndex.__OFFSET.unpack_from(self.__map, self.__pron_offsets + pron_id * 8)[0]
+        end: int = LexiconIndex.__OFFSET.unpack_from(self.__map, self.__pron_offsets + (pron_id + 1) * 8)[0]
+
+        return self.__map[self.__prons + start:self.__prons + end].decode('utf-8')
+
+    def __get_word(self, word_id: int) -> bytes:
+        start: int = LexiconIndex.__OFFSET.unpack_from(self.__map, self.__word_offsets + word_id * 8)[0]
+        end: int = LexiconIndex.__OFFSET.unpack_from(self.__map, self.__word_offsets + (word_id + 1) * 8)[0]
+
+        return self.__map[self.__words + start:self.__words + end]
+
+    def __enter__(self):
+        self.__file = open(self.__path, mode='rb')
+        self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, word_count, pron_count, ref_count = LexiconIndex.__HEADER.unpack_from(self.__map, 0)
+
+        if magic != LexiconIndex.MAGIC or version != LexiconIndex.__VERSION:
+            self.__exit__(None, None, None)
+            raise Exception(f'File is not a supported lexicon index: "{self.__path}"')
+
+        self.__word_count = word_count
+        self.__word_offsets = LexiconIndex.__HEADER.size
+        self.__word_refs = self.__word_offsets + (word_count + 1) * 8
+        self.__refs = self.__word_refs + (word_count + 1) * 4
+        self.__pron_offsets = self.__refs + ref_count * 4
+        self.__words = self.__pron_offsets + (pron_count + 1) * 8
+        words_size: int = LexiconIndex.__OFFSET.unpack_from(self.__map, self.__word_offsets + word_count * 8)[0]
+        self.__prons = self.__words + words_size
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __len__(self) -> int:
+        return self.__word_count
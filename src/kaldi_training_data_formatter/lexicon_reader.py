@@ -0,0 +1,31 @@
+﻿from typing import Final, Collection
+
+from src.kaldi_training_data_formatter import AbstractFileReader, PhoneLexicon, ReaderBackend
+
+
+class LexiconReader(AbstractFileReader):
+    BUFFER_SIZE: Final[int] = 1 << 20
+
+    def __init__(self, filepath: str, backend: ReaderBackend = ReaderBackend.Stream):
+        super().__init__(filepath, encoding='utf-8-sig', is_file=True, backend=backend)
+
+    def read_lexicon(self, write_lexicon: PhoneLexicon, vocabulary: Collection[str] | None = None) -> None:
+        while lines := self._read_lines(LexiconReader.BUFFER_SIZE):
+            line_num: int = self._current_line - len(lines)
+
+            for line in lines:
+                line_num += 1
+                elements: list[str] = line.split()
+
+                if len(elements) < 2:
+                    print(f'Too few elements on line {line_num} in lexicon: "{self._filepath}"')
+                    continue
+
+                word: str = elements[0].lower()
+
+                # Drop words outside the vocabulary before building their phones
+                if vocabulary is not None and word not in vocabulary:
+                    continue
+
+                del elements[0]
+                write_lexicon.add(word, map(str.upper, elements))
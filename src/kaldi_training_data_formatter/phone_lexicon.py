@@ -0,0 +1,72 @@
+﻿from collections.abc import Mapping
+from typing import Final, Iterable, Iterator, Tuple
+
+
+class PhoneLexicon(Mapping):
+    def __init__(self):
+        # Phone symbols are stored once and pronunciations refer to them by index
+        self.__phone_ids: Final[dict[str, int]] = {}
+        self.__phones: Final[list[str]] = []
+
+        # Identical pronunciations share one tuple across all words
+        self.__pronunciations: Final[dict[Tuple[int, ...], Tuple[int, ...]]] = {}
+        self.__entries: Final[dict[str, Tuple[Tuple[int, ...], ...]]] = {}
+
+    @property
+    def phones(self) -> list[str]:
+        return self.__phones
+
+    @property
+    def pronunciation_count(self) -> int:
+        return len(self.__pronunciations)
+
+    def add(self, word: str, phones: Iterable[str]) -> None:
+        phone_ids: dict[str, int] = self.__phone_ids
+        ids: list[int] = []
+
+        for phone in phones:
+            phone_id: int | None = phone_ids.get(phone)
+
+            if phone_id is None:
+                phone_id = len(self.__phones)
+                phone_ids[phone] = phone_id
+                self.__phones.append(phone)
+
+            ids.append(phone_id)
+
+        key: Tuple[int, ...] = tuple(ids)
+        pronunciation: Tuple[int, ...] = self.__pronunciations.setdefault(key, key)
+        existing: Tuple[Tuple[int, ...], ...] | None = self.__entries.get(word)
+
+        if existing is None:
+            self.__entries[word] = (pronunciation,)
+        elif pronunciation not in existing:
+            self.__entries[word] = existing + (pronunciation,)
+
+    def add_word(self, word: str) -> None:
+        if word not in self.__entries:
+            self.__entries[word] = ()
+
+    def clear(self) -> None:
+        self.__phone_ids.clear()
+        self.__phones.clear()
+        self.__pronunciations.clear()
+        self.__entries.clear()
+
+    def decode(self, pronunciation: Tuple[int, ...]) -> str:
+        return ' '.join([self.__phones[phone_id] for phone_id in pronunciation])
+
+    def get_pronunciations(self, word: str) -> Tuple[Tuple[int, ...], ...]:
+        return self.__entries[word]
+
+    def __contains__(self, word: object) -> bool:
+        return word in self.__entries
+
+    def __getitem__(self, word: str) -> set[str]:
+        return {self.decode(pronunciation) for pronunciation in self.__entries[word]}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__entries)
+
+    def __len__(self) -> int:
+        return len(self.__entries)
@@ -15,3 +15,8 @@ class ProjectUtil:
                 return None, os.path.split(project_dir)[1]
         else:
             return None, None
+
+    @staticmethod
+    def get_utterance_id(speaker_id: str, chapter_id: str, line_id: str) -> str:
+        # Kaldi expects utterance IDs to start with the speaker ID so both sort the same way
+        return f'{speaker_id}-{chapter_id}-{line_id.strip("[]")}'
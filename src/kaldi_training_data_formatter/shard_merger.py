@@ -0,0 +1,127 @@
+﻿import heapq
+import os.path
+import re
+from typing import Any, Callable, Final, Iterator, Tuple
+
+from src.kaldi_training_data_formatter import AtomicWriter, ExternalSorter, LexiconCompiler, SortOrder
+
+
+class ShardMerger:
+    def __init__(self, root: str, sort_order: SortOrder = SortOrder.CodePoint):
+        self.__root: Final[str] = root
+        self.__sort_order: Final[SortOrder] = sort_order
+
+    @staticmethod
+    def get_shard_filename(filename: str, shard: int, shard_count: int) -> str:
+        stem, extension = os.path.splitext(filename)
+
+        return f'{stem}.{shard}-of-{shard_count}{extension}'
+
+    def find_shard_files(self, filename: str) -> list[str]:
+        stem, extension = os.path.splitext(filename)
+        pattern: re.Pattern = re.compile(rf'^{re.escape(stem)}\.(\d+)-of-(\d+){re.escape(extension)}$')
+        shards: dict[int, set[int]] = {}
+
+        for name in os.listdir(self.__root):
+            if match := pattern.match(name):
+                shards.setdefault(int(match.group(2)), set()).add(int(match.group(1)))
+
+        if len(shards) == 0:
+            raise Exception(f'No partial outputs for "{filename}" in: "{self.__root}"')
+
+        if len(shards) > 1:
+            raise Exception(f'Partial outputs for "{filename}" come from different shard counts: {sorted(shards)}')
+
+        # Merging an incomplete set would silently drop words, so every shard has to be present
+        shard_count, found = next(iter(shards.items()))
+        missing: list[int] = sorted(set(range(shard_count)).difference(found))
+
+        if len(missing) > 0:
+            raise Exception(f'Missing shards {missing} of {shard_count} for "{filename}" in: "{self.__root}"')
+
+        return [os.path.join(self.__root, ShardMerger.get_shard_filename(filename, i, shard_count))
+                for i in range(shard_count)]
+
+    def merge_vocabulary(self, paths: list[str], filename: str) -> int:
+        key: Callable[[str], Any] | None = ExternalSorter.create_key(ShardMerger.__split_count_line, self.__sort_order)
+        word_count: int = 0
+
+        def merged_words() -> Iterator[str]:
+            nonlocal word_count
+            previous_word: str | None = None
+
+            for line in heapq.merge(*map(ShardMerger.__read_lines, paths), key=key):
+                word: str = ShardMerger.__split_count_line(line)[0]
+
+                # Words shared by several shards are adjacent after the merge
+                if word != previous_word:
+                    previous_word = word
+                    word_count += 1
+
+                    yield word
+
+        self.__write_file(filename, merged_words())
+
+        return word_count
+
+    def merge_lexicon(self, paths: list[str], filename: str) -> int:
+        key: Callable[[str], Any] | None = ExternalSorter.create_key(ShardMerger.__split_lexicon_line,
+                                                                     self.__sort_order)
+        line_count: int = 0
+
+        def merged_lines() -> Iterator[str]:
+            nonlocal line_count
+            lines: Iterator[str] = heapq.merge(*map(ShardMerger.__read_lines, paths), key=key)
+
+            for word, word_lines in ShardMerger.__group_words(lines):
+                # A shard without phones for a word only writes the placeholder, which another shard may fill in
+                real_lines: list[str] = [line for line in word_lines
+                                         if ShardMerger.__split_lexicon_line(line)[1] != LexiconCompiler.NO_PHONES]
+                unique_lines: list[str] = list(dict.fromkeys(real_lines if len(real_lines) > 0 else word_lines))
+                line_count += len(unique_lines)
+
+                yield from unique_lines
+
+        self.__write_file(filename, merged_lines())
+
+        return line_count
+
+    def __write_file(self, filename: str, lines: Iterator[str]) -> None:
+        with AtomicWriter(os.path.join(self.__root, filename), encoding='utf-8') as writer:
+            writer.write_lines(lines)
+
+    @staticmethod
+    def __group_words(lines: Iterator[str]) -> Iterator[Tuple[str, list[str]]]:
+        current_word: str | None = None
+        word_lines: list[str] = []
+
+        for line in lines:
+            word: str = ShardMerger.__split_lexicon_line(line)[0]
+
+            if word != current_word and current_word is not None:
+                yield current_word, word_lines
+                word_lines = []
+
+            current_word = word
+            word_lines.append(line)
+
+        if current_word is not None:
+            yield current_word, word_lines
+
+    @staticmethod
+    def __read_lines(path: str) -> Iterator[str]:
+        with open(path, mode='r', encoding='utf-8') as f:
+            for line in f:
+                yield line.rstrip('\n')
+
+    @staticmethod
+    def __split_count_line(line: str) -> Tuple[str, int]:
+        word, _, count = line.rpartition(' ')
+
+        return word, int(count)
+
+    @staticmethod
+    def __split_lexicon_line(line: str) -> Tuple[str, str]:
+        word, _, phones = line.partition(' ')
+
+        return word, phones
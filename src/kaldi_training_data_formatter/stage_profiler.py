@@ -0,0 +1,91 @@
+﻿import cProfile
+import os.path
+import tracemalloc
+from enum import Enum
+from typing import Final
+
+from src.kaldi_training_data_formatter import AtomicWriter
+
+
+class ProfileMode(Enum):
+    # cProfile statistics of the main thread
+    Cpu = 0
+
+    # tracemalloc allocation report
+    Memory = 1
+
+
+class StageProfiler:
+    FILE_PREFIX: Final[str] = 'ktdf-profile-'
+    TOP_COUNT: Final[int] = 25
+
+    def __init__(self, mode: ProfileMode, output_dir: str, top_count: int = TOP_COUNT):
+        self.__mode: Final[ProfileMode] = mode
+        self.__output_dir: Final[str] = output_dir
+        self.__top_count: Final[int] = top_count
+        self.__profile: cProfile.Profile | None = None
+        self.__paths: Final[list[str]] = []
+
+    @property
+    def mode(self) -> ProfileMode:
+        return self.__mode
+
+    @property
+    def paths(self) -> list[str]:
+        return self.__paths
+
+    def start(self, stage: str) -> None:
+        match self.__mode:
+            case ProfileMode.Cpu:
+                self.__profile = cProfile.Profile()
+                self.__profile.enable()
+
+            case ProfileMode.Memory:
+                tracemalloc.start()
+
+            case _:
+                raise Exception(f'Invalid profile mode {self.__mode}')
+
+    def stop(self, stage: str) -> str:
+        os.makedirs(self.__output_dir, exist_ok=True)
+        path: str
+
+        match self.__mode:
+            case ProfileMode.Cpu:
+                self.__profile.disable()
+                path = os.path.join(self.__output_dir, f'{StageProfiler.FILE_PREFIX}{stage}.prof')
+                self.__profile.dump_stats(path)
+                self.__profile = None
+
+            case ProfileMode.Memory:
+                snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                path = os.path.join(self.__output_dir, f'{StageProfiler.FILE_PREFIX}{stage}.txt')
+                self.__write_memory_report(path, stage, snapshot, current, peak)
+
+            case _:
+                raise Exception(f'Invalid profile mode {self.__mode}')
+
+        self.__paths.append(path)
+
+        return path
+
+    def __write_memory_report(self,
+                              path: str,
+                              stage: str,
+                              snapshot: tracemalloc.Snapshot,
+                              current: int,
+                              peak: int) -> None:
+        # Leave out the profiler's own allocations
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        statistics: list[tracemalloc.Statistic] = snapshot.statistics('lineno')
+
+        with AtomicWriter(path, encoding='utf-8') as writer:
+            writer.write_lines([
+                f'Stage: {stage}',
+                f'Current: {current} bytes',
+                f'Peak: {peak} bytes',
+                f'Top {self.__top_count} allocations still held at the end of the stage:',
+            ])
+            writer.write_lines(str(statistic) for statistic in statistics[:self.__top_count])
@@ -1,7 +1,11 @@
-﻿from typing import Tuple
+﻿from typing import Final, Tuple
 
 
 class TranscriptLine:
+    __slots__ = ('__id', '__text')
+
+    __CONTROL_WHITE_SPACE: Final[str] = '\t\x0b\x0c\x1c\x1d\x1e\x1f'
+
     def __init__(self, line_id: str, text: list[str]):
         self.__id: str = line_id
         self.__text: list[str] = text
@@ -12,6 +16,35 @@ class TranscriptLine:
 
         return cls(line_id, text)
 
+    @staticmethod
+    def parse_block(block: str) -> Tuple[list[str], list[list[str]]]:
+        line_ids: list[str] = []
+        texts: list[list[str]] = []
+
+        # Match the line endings that text mode reading translates
+        if '\r' in block:
+            block = block.replace('\r\n', '\n').replace('\r', '\n')
+
+        # Without tabs, other control white-space or non-ASCII text, splitting on all white-space
+        # gives the same tokens as `from_line`
+        is_simple: bool = block.isascii() and not any(c in block for c in TranscriptLine.__CONTROL_WHITE_SPACE)
+
+        for line in block.split('\n'):
+            if not line.strip(' '):
+                continue  # Skip blank lines like `TranscriptReader`
+
+            if is_simple:
+                data: list[str] = line.split()
+                line_ids.append(data[0])
+                del data[0]
+                texts.append(data)
+            else:
+                line_id, text = TranscriptLine.__parse_line(line)
+                line_ids.append(line_id)
+                texts.append(text)
+
+        return line_ids, texts
+
     @property
     def id(self) -> str:
         return self.__id
@@ -1,18 +1,37 @@
-﻿from src.kaldi_training_data_formatter import AbstractFileReader, TranscriptLine
+﻿from typing import Iterator, Tuple
+
+from src.kaldi_training_data_formatter import AbstractFileReader, ReaderBackend, TranscriptLine
 
 
 class TranscriptReader(AbstractFileReader):
-    def __init__(self, filepath: str):
-        super().__init__(filepath, encoding='utf-8-sig', is_file=True)
+    def __init__(self, filepath: str, backend: ReaderBackend = ReaderBackend.Stream):
+        super().__init__(filepath, encoding='utf-8-sig', is_file=True, backend=backend)
 
-    def read_all_lines(self) -> list[TranscriptLine]:
-        lines: list[TranscriptLine] = []
+    def iter_numbered(self) -> Iterator[Tuple[int, TranscriptLine]]:
+        # Line numbers count from 1 and include blank lines, so they match what an editor shows
         line: TranscriptLine
 
         while line := self.read_transcript_line():
-            lines.append(line)
+            yield self._current_line, line
+
+    def read_all_lines(self) -> list[TranscriptLine]:
+        return list(self)
+
+    def read_batches(self, batch_size: int) -> Iterator[list[TranscriptLine]]:
+        if batch_size < 1:
+            raise Exception(f'Batch size must be positive: {batch_size}')
+
+        batch: list[TranscriptLine] = []
 
-        return lines
+        for line in self:
+            batch.append(line)
+
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+        if len(batch) > 0:
+            yield batch
 
     def read_transcript_line(self) -> TranscriptLine | None:
         line: str
@@ -27,3 +46,9 @@ class TranscriptReader(AbstractFileReader):
             return TranscriptLine.from_line(line)
         except Exception as e:
             raise e
+
+    def __iter__(self) -> Iterator[TranscriptLine]:
+        line: TranscriptLine
+
+        while line := self.read_transcript_line():
+            yield line
@@ -0,0 +1,81 @@
+﻿from array import array
+from typing import Final, Iterable, Iterator
+
+from src.kaldi_training_data_formatter import TranscriptLine
+
+
+class TranscriptTable:
+    __slots__ = ('__ids', '__offsets', '__tokens', '__word_ids', '__words')
+
+    def __init__(self, lines: Iterable[TranscriptLine] | None = None):
+        self.__ids: Final[list[str]] = []
+
+        # Text of line `i` is `__tokens[__offsets[i]:__offsets[i + 1]]`, stored as indices into `__words`
+        self.__offsets: Final[array] = array('Q', [0])
+        self.__tokens: Final[array] = array('I')
+        self.__word_ids: Final[dict[str, int]] = {}
+        self.__words: Final[list[str]] = []
+
+        if lines is not None:
+            self.extend(lines)
+
+    @property
+    def token_count(self) -> int:
+        return len(self.__tokens)
+
+    @property
+    def words(self) -> list[str]:
+        return self.__words
+
+    def append(self, line: TranscriptLine) -> None:
+        self.append_line(line.id, line.text)
+
+    def append_line(self, line_id: str, text: Iterable[str]) -> None:
+        word_ids: dict[str, int] = self.__word_ids
+
+        for word in text:
+            word_id: int | None = word_ids.get(word)
+
+            if word_id is None:
+                word_id = len(self.__words)
+                word_ids[word] = word_id
+                self.__words.append(word)
+
+            self.__tokens.append(word_id)
+
+        self.__ids.append(line_id)
+        self.__offsets.append(len(self.__tokens))
+
+    def extend(self, lines: Iterable[TranscriptLine]) -> None:
+        for line in lines:
+            self.append(line)
+
+    def get_id(self, index: int) -> str:
+        return self.__ids[index]
+
+    def get_text(self, index: int) -> list[str]:
+        index = range(len(self.__ids))[index]  # Normalizes negative indices and checks bounds
+
+        return [self.__words[word_id] for word_id in self.__tokens[self.__offsets[index]:self.__offsets[index + 1]]]
+
+    def __eq__(self, other) -> bool:
+        if other is None:
+            return False
+
+        if self is other:
+            return True
+
+        if not isinstance(other, TranscriptTable):
+            return False
+
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __getitem__(self, index: int) -> TranscriptLine:
+        return TranscriptLine(self.get_id(index), self.get_text(index))
+
+    def __iter__(self) -> Iterator[TranscriptLine]:
+        for index in range(len(self.__ids)):
+            yield self[index]
+
+    def __len__(self) -> int:
+        return len(self.__ids)
@@ -1,77 +1,215 @@
-﻿import os.path
-from typing import Final
+﻿import math
+import os.path
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Final, Iterator, Tuple
 
-from src.kaldi_training_data_formatter import ProjectUtil
+from src.kaldi_training_data_formatter import (AtomicWriter, BuildCache, CompressionUtil, CorpusIndex, ExternalSorter,
+                                               SortOrder, VocabularyIndex)
 
 
 class VocabCompiler:
     VOCAB_FILENAME: Final[str] = 'vocab.txt'
-
-    def __init__(self, input_root: str, output_root: str):
+    VOCAB_COUNTS_FILENAME: Final[str] = 'vocab-counts.txt'
+
+    def __init__(self,
+                 input_root: str,
+                 output_root: str,
+                 jobs: int = 1,
+                 use_cache: bool = False,
+                 max_sort_lines: int | None = None,
+                 sort_order: SortOrder = SortOrder.CodePoint,
+                 cache_filename: str = BuildCache.VOCABULARY_FILENAME):
         self.__input_root: Final[str] = input_root
         self.__output_root: Final[str] = output_root
-        self.__vocabulary: Final[set[str]] = set()
+        self.__jobs: Final[int] = max(1, jobs)
+        self.__cache: Final[BuildCache | None] = BuildCache(input_root, cache_filename) if use_cache else None
+        self.__max_sort_lines: Final[int | None] = max_sort_lines
+        self.__sort_order: Final[SortOrder] = sort_order
+        self.__index: Final[VocabularyIndex] = VocabularyIndex()
+        self.__file_stats: Final[dict[str, Tuple[int, int]]] = {}
+        self.__transcripts_read: int = 0
+        self.__lines_read: int = 0
+        self.__bytes_read: int = 0
+        self.__bytes_written: int = 0
 
     @classmethod
-    def from_root(cls, root: str):
-        return cls(root, root)
+    def from_root(cls,
+                  root: str,
+                  jobs: int = 1,
+                  use_cache: bool = False,
+                  max_sort_lines: int | None = None,
+                  sort_order: SortOrder = SortOrder.CodePoint,
+                  cache_filename: str = BuildCache.VOCABULARY_FILENAME):
+        return cls(root, root, jobs, use_cache, max_sort_lines, sort_order, cache_filename)
 
     @property
-    def vocabulary(self) -> set[str]:
-        return self.__vocabulary
+    def bytes_read(self) -> int:
+        return self.__bytes_read
 
-    def read_vocabulary(self) -> None:
-        self.vocabulary.clear()
+    @property
+    def bytes_written(self) -> int:
+        return self.__bytes_written
 
-        if not os.path.isdir(self.__input_root):
-            raise Exception(f'Directory does not exist: "{self.__input_root}"')
+    @property
+    def jobs(self) -> int:
+        return self.__jobs
 
-        visited_projects: set[str] = set()
-        directory_queue: list[str] = [self.__input_root]
+    @property
+    def lines_read(self) -> int:
+        return self.__lines_read
 
-        while len(directory_queue) > 0:
-            directory: str = directory_queue.pop()
+    @property
+    def transcripts_read(self) -> int:
+        return self.__transcripts_read
+
+    @property
+    def use_cache(self) -> bool:
+        return self.__cache is not None
+
+    @property
+    def vocabulary(self) -> set[str]:
+        return self.__index.vocabulary
 
-            if not os.path.isdir(directory):
-                print(f'Could not find directory: "{directory}"')
-                continue
+    @property
+    def vocabulary_index(self) -> VocabularyIndex:
+        return self.__index
 
-            entries: list[str] = [os.path.join(directory, f) for f in os.listdir(directory)]
-            files: list[str] = [f for f in entries if os.path.isfile(f) and f.endswith('.trans.txt')]
-            file: str | None = files[0] if len(files) > 0 else None
+    def read_vocabulary(self, index: CorpusIndex | None = None) -> None:
+        if index is None:
+            index = CorpusIndex.from_root(self.__input_root)
 
-            # If no transcript file was found then try adding subdirectories and skip this directory
-            if not file:
-                directory_queue += [d for d in entries if os.path.isdir(d)]
-                continue
+        visited_projects: set[str] = set()
+        files: list[str] = []
+        self.__transcripts_read = 0
+        self.__lines_read = 0
+        self.__bytes_read = 0
 
+        for entry in index:
             # Add project name to set of visited projects
-            _, project_id = ProjectUtil.get_user_and_project_id(directory)
+            project_id: str | None = entry.project_id
 
             if project_id in visited_projects:
                 continue  # Skip if already visited
 
             visited_projects.add(project_id)
+            files.append(entry.transcript_path)
+
+        if self.__cache is None:
+            self.__index.clear()
+
+            for file, counts in zip(files, self.__read_transcripts(files)):
+                self.__index.add_file(file, counts)
+
+            return
+
+        self.__cache.load()
+        removed_count: int = self.__cache.retain(files)
+
+        # Forget transcripts that are no longer part of the corpus
+        for file in self.__index.files.difference(files):
+            self.__index.remove_file(file)
+            del self.__file_stats[file]
+
+        # Only read transcripts that changed since the index or the cache was updated
+        stats: dict[str, os.stat_result] = {file: os.stat(file) for file in files}
+        changed_files: list[str] = []
+
+        for file in files:
+            stat: os.stat_result = stats[file]
+            file_stat: Tuple[int, int] = (stat.st_mtime_ns, stat.st_size)
+
+            if self.__file_stats.get(file) == file_stat:
+                continue  # Index is up to date
 
-            # Read vocabulary from transcript file
-            with open(file, mode='r', encoding='utf-8-sig') as f:
-                line: str
+            cached_counts: dict[str, int] | None = self.__cache.get_counts(file, stat)
 
-                while line := f.readline():
-                    self.vocabulary.update(line.strip('\n\r ').lower().split(' ')[1:])
+            if cached_counts is None:
+                changed_files.append(file)
+            else:
+                self.__index.update_file(file, cached_counts)
+                self.__file_stats[file] = file_stat
 
-    def save_vocabulary(self) -> None:
-        filepath: str = os.path.join(self.__output_root, VocabCompiler.VOCAB_FILENAME)
-        sorted_vocab: list[str] = []
-        sorted_vocab += self.vocabulary
-        sorted_vocab.sort()
+        for file, counts in zip(changed_files, self.__read_transcripts(changed_files)):
+            stat: os.stat_result = stats[file]
+            self.__cache.put_counts(file, stat, counts)
+            self.__index.update_file(file, counts)
+            self.__file_stats[file] = (stat.st_mtime_ns, stat.st_size)
+
+        if len(changed_files) > 0 or removed_count > 0:
+            self.__cache.save()
+
+    def save_vocabulary(self, filename: str = VOCAB_FILENAME) -> None:
+        filepath: str = os.path.join(self.__output_root, filename)
 
         try:
             os.makedirs(self.__output_root, exist_ok=True)
 
-            with open(filepath, mode='w', encoding='utf-8') as f:  # Never write vocabulary with BOM
-                for vocab in sorted_vocab:
-                    f.write(vocab)
-                    f.write('\n')
+            # Sorted runs are spilled to disk once there are more than `max_sort_lines` words
+            with ExternalSorter(self.__max_sort_lines, order=self.__sort_order) as sorter, \
+                    AtomicWriter(filepath, encoding='utf-8') as writer:  # Never write vocabulary with BOM
+                for vocab in self.vocabulary:
+                    sorter.add(vocab)
+
+                writer.write_lines(sorter.sorted_lines())
+
+            self.__bytes_written = os.path.getsize(filepath)
         except Exception as e:
             print(f'Error while saving vocabulary file: ' + str(e))
+
+    def save_vocabulary_counts(self, filename: str = VOCAB_COUNTS_FILENAME) -> None:
+        filepath: str = os.path.join(self.__output_root, filename)
+        counts: dict[str, int] = self.__index.counts
+
+        try:
+            os.makedirs(self.__output_root, exist_ok=True)
+
+            # Sorted by word like the vocabulary, so partial counts from several shards can be merged as streams
+            with ExternalSorter(self.__max_sort_lines, order=self.__sort_order) as sorter, \
+                    AtomicWriter(filepath, encoding='utf-8') as writer:
+                for vocab in self.vocabulary:
+                    sorter.add(vocab)
+
+                writer.write_lines(f'{vocab} {counts[vocab]}' for vocab in sorter.sorted_lines())
+
+            self.__bytes_written = os.path.getsize(filepath)
+        except Exception as e:
+            print(f'Error while saving vocabulary counts file: ' + str(e))
+
+    @staticmethod
+    def read_transcript_counts(file: str) -> Tuple[dict[str, int], int, int]:
+        counts: Counter[str] = Counter()
+        line_count: int = 0
+
+        # Read vocabulary from transcript file
+        with CompressionUtil.open_text(file, encoding='utf-8-sig') as f:
+            line: str
+
+            while line := f.readline():
+                counts.update(line.strip('\n\r ').lower().split(' ')[1:])
+                line_count += 1
+
+        return dict(counts), line_count, os.path.getsize(file)
+
+    def __read_transcripts(self, files: list[str]) -> Iterator[dict[str, int]]:
+        results: Iterator[Tuple[dict[str, int], int, int]]
+
+        if self.__jobs <= 1 or len(files) <= 1:
+            results = map(VocabCompiler.read_transcript_counts, files)
+            yield from self.__count_transcripts(results)
+            return
+
+        # Give each worker a few batches so that slow files do not leave the other workers idle
+        chunk_size: int = math.ceil(len(files) / (self.__jobs * 4))
+
+        with ProcessPoolExecutor(max_workers=self.__jobs) as executor:
+            results = executor.map(VocabCompiler.read_transcript_counts, files, chunksize=chunk_size)
+            yield from self.__count_transcripts(results)
+
+    def __count_transcripts(self, results: Iterator[Tuple[dict[str, int], int, int]]) -> Iterator[dict[str, int]]:
+        for counts, line_count, byte_count in results:
+            self.__transcripts_read += 1
+            self.__lines_read += line_count
+            self.__bytes_read += byte_count
+
+            yield counts
@@ -0,0 +1,75 @@
+﻿from typing import Final, Iterator, Mapping
+
+
+class VocabularyIndex:
+    def __init__(self):
+        self.__counts: Final[dict[str, int]] = {}
+        self.__files: Final[dict[str, dict[str, int]]] = {}
+        self.__vocabulary: Final[set[str]] = set()
+
+    @property
+    def counts(self) -> dict[str, int]:
+        return self.__counts
+
+    @property
+    def files(self) -> set[str]:
+        return set(self.__files.keys())
+
+    @property
+    def vocabulary(self) -> set[str]:
+        return self.__vocabulary
+
+    def add_file(self, path: str, counts: Mapping[str, int]) -> None:
+        if path in self.__files:
+            raise Exception(f'File is already in vocabulary index: "{path}"')
+
+        contribution: dict[str, int] = {word: count for word, count in counts.items() if count > 0}
+        self.__files[path] = contribution
+
+        for word, count in contribution.items():
+            total: int = self.__counts.get(word, 0)
+
+            if total == 0:
+                self.__vocabulary.add(word)
+
+            self.__counts[word] = total + count
+
+    def clear(self) -> None:
+        self.__counts.clear()
+        self.__files.clear()
+        self.__vocabulary.clear()
+
+    def get_frequent_words(self, min_count: int) -> set[str]:
+        return {word for word, count in self.__counts.items() if count >= min_count}
+
+    def get_file_counts(self, path: str) -> dict[str, int] | None:
+        return self.__files.get(path)
+
+    def remove_file(self, path: str) -> None:
+        contribution: dict[str, int] | None = self.__files.pop(path, None)
+
+        if contribution is None:
+            return
+
+        for word, count in contribution.items():
+            total: int = self.__counts[word] - count
+
+            # Forget words that no longer appear in any file
+            if total > 0:
+                self.__counts[word] = total
+            else:
+                del self.__counts[word]
+                self.__vocabulary.discard(word)
+
+    def update_file(self, path: str, counts: Mapping[str, int]) -> None:
+        self.remove_file(path)
+        self.add_file(path, counts)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.__counts
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__counts)
+
+    def __len__(self) -> int:
+        return len(self.__counts)
@@ -0,0 +1,21 @@
+﻿import os.path
+from typing import Final
+
+
+class CorpusBuilder:
+    DEFAULT_TEXT: Final[str] = '0000 hello world\n'
+
+    @staticmethod
+    def create_transcript(root: str,
+                          user_id: str,
+                          project_id: str,
+                          chapter_id: str,
+                          text: str = DEFAULT_TEXT) -> str:
+        directory: str = os.path.join(root, user_id, project_id, chapter_id)
+        os.makedirs(directory)
+        path: str = os.path.join(directory, f'{chapter_id}.trans.txt')
+
+        with open(path, mode='w', encoding='utf-8') as f:
+            f.write(text)
+
+        return path
@@ -0,0 +1,56 @@
+﻿import os
+import tempfile
+import unittest
+
+from src.kaldi_training_data_formatter import AtomicWriter
+
+
+class TestAtomicWriter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path: str = os.path.join(self.temp_dir.name, 'vocab.txt')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_write_lines_creates_file_with_one_line_per_entry(self):
+        # Arrange
+        lines: list[str] = [str(i) for i in range(AtomicWriter.BATCH_LINES + 1)]
+
+        # Act
+        with AtomicWriter(self.path) as class_under_test:
+            class_under_test.write_lines(lines)
+
+        # Assert
+        with open(self.path, mode='r', encoding='utf-8') as f:
+            self.assertEqual('\n'.join(lines) + '\n', f.read())
+
+    def test_write_lines_leaves_no_temporary_files(self):
+        # Act
+        with AtomicWriter(self.path) as class_under_test:
+            class_under_test.write_lines(['fire'])
+
+        # Assert
+        self.assertListEqual(['vocab.txt'], os.listdir(self.temp_dir.name))
+
+    def test_exit_when_exception_is_raised_keeps_existing_file(self):
+        # Arrange
+        with open(self.path, mode='w', encoding='utf-8') as f:
+            f.write('old\n')
+
+        # Act
+        with self.assertRaises(ValueError):
+            with AtomicWriter(self.path) as class_under_test:
+                class_under_test.write_lines(['new'])
+                raise ValueError()
+
+        # Assert
+        with self.subTest():
+            self.assertListEqual(['vocab.txt'], os.listdir(self.temp_dir.name))
+        with self.subTest():
+            with open(self.path, mode='r', encoding='utf-8') as f:
+                self.assertEqual('old\n', f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
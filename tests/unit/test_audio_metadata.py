@@ -0,0 +1,104 @@
+﻿import os
+import tempfile
+import unittest
+import wave
+
+from src.kaldi_training_data_formatter import AudioInfo, AudioMetadata, AudioMetadataIndex
+
+
+class TestAudioMetadata(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root: str = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_read_given_wav_file_reads_header(self):
+        # Arrange
+        path: str = self.__create_wav('0000.wav', 16000, 8000)
+
+        # Act
+        actual: AudioInfo | None = AudioMetadata.read(path)
+
+        # Assert
+        with self.subTest():
+            self.assertEqual(AudioInfo(16000, 1, 8000), actual)
+        with self.subTest():
+            self.assertAlmostEqual(0.5, actual.duration)
+
+    def test_read_given_flac_file_reads_streaminfo(self):
+        param_list: list[tuple[str, bytes]] = [
+            ('0000.flac', b''),
+            ('0001.flac', b'ID3\x04\x00\x00\x00\x00\x00\x02id'),
+        ]
+
+        for filename, prefix in param_list:
+            with self.subTest(filename=filename):
+                # Arrange
+                path: str = self.__create_flac(filename, prefix, 44100, 2, 88200)
+
+                # Act
+                actual: AudioInfo | None = AudioMetadata.read(path)
+
+                # Assert
+                self.assertEqual(AudioInfo(44100, 2, 88200), actual)
+
+    def test_read_given_invalid_file_returns_none(self):
+        # Arrange
+        path: str = os.path.join(self.root, '0000.flac')
+
+        with open(path, mode='wb') as f:
+            f.write(b'not audio')
+
+        # Act
+        actual: AudioInfo | None = AudioMetadata.read(path)
+
+        # Assert
+        self.assertIsNone(actual)
+
+    def test_update_only_reads_changed_files(self):
+        # Arrange
+        paths: list[str] = [self.__create_wav('0000.wav', 8000, 8000), self.__create_wav('0001.wav', 8000, 4000)]
+        first: AudioMetadataIndex = AudioMetadataIndex(self.root)
+        first.load()
+        first.update(paths, jobs=2)
+        first.save()
+        self.__create_wav('0001.wav', 8000, 16000)
+        os.utime(paths[1], ns=(0, 0))
+        class_under_test: AudioMetadataIndex = AudioMetadataIndex(self.root)
+        class_under_test.load()
+
+        # Act
+        actual_count: int = class_under_test.update(paths)
+
+        # Assert
+        with self.subTest():
+            self.assertEqual(1, actual_count)
+        with self.subTest():
+            self.assertAlmostEqual(3.0, class_under_test.get_total_duration(paths))
+
+    def __create_flac(self, filename: str, prefix: bytes, sample_rate: int, channels: int, frame_count: int) -> str:
+        path: str = os.path.join(self.root, filename)
+        packed: int = sample_rate << 44 | (channels - 1) << 41 | (16 - 1) << 36 | frame_count
+        streaminfo: bytes = bytes(10) + packed.to_bytes(8, 'big') + bytes(16)
+
+        with open(path, mode='wb') as f:
+            f.write(prefix + b'fLaC' + b'\x80' + len(streaminfo).to_bytes(3, 'big') + streaminfo)
+
+        return path
+
+    def __create_wav(self, filename: str, sample_rate: int, frame_count: int) -> str:
+        path: str = os.path.join(self.root, filename)
+
+        with wave.open(path, mode='wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(sample_rate)
+            f.writeframes(bytes(2 * frame_count))
+
+        return path
+
+
+if __name__ == '__main__':
+    unittest.main()
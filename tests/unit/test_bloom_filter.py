@@ -0,0 +1,42 @@
+﻿import unittest
+
+from src.kaldi_training_data_formatter import BloomFilter
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_add_returns_whether_item_may_have_been_added(self):
+        # Arrange
+        class_under_test: BloomFilter = BloomFilter(100)
+
+        # Act
+        first: bool = class_under_test.add('user-1-0000')
+        second: bool = class_under_test.add('user-1-0000')
+
+        # Assert
+        with self.subTest():
+            self.assertFalse(first)
+        with self.subTest():
+            self.assertTrue(second)
+        with self.subTest():
+            self.assertIn('user-1-0000', class_under_test)
+
+    def test_contains_has_no_false_negatives_and_few_false_positives(self):
+        # Arrange
+        class_under_test: BloomFilter = BloomFilter(10_000, 0.01)
+        items: list[str] = [f'user-{i}' for i in range(10_000)]
+
+        for item in items:
+            class_under_test.add(item)
+
+        # Act
+        false_positives: int = sum(f'other-{i}' in class_under_test for i in range(10_000))
+
+        # Assert
+        with self.subTest():
+            self.assertTrue(all(item in class_under_test for item in items))
+        with self.subTest():
+            self.assertLess(false_positives, 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+﻿import bz2
+import gzip
+import importlib.util
+import lzma
+import os
+import tempfile
+import unittest
+
+from src.kaldi_training_data_formatter import Compression, CompressionUtil
+
+
+class TestCompressionUtil(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root: str = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_open_text_decompresses_by_extension_or_magic_bytes(self):
+        text: str = '﻿[0000] fire\r\n[0001] wörd\n'
+        param_list: list[tuple[str, Compression | None, bytes]] = [
+            # filename, expected_compression, data
+            ('plain.trans.txt', None, text.encode('utf-8')),
+            ('a.trans.txt.gz', Compression.Gzip, gzip.compress(text.encode('utf-8'))),
+            ('a.trans.txt.bz2', Compression.Bz2, bz2.compress(text.encode('utf-8'))),
+            ('a.trans.txt.xz', Compression.Lzma, lzma.compress(text.encode('utf-8'))),
+            ('gzip-without-extension.txt', Compression.Gzip, gzip.compress(text.encode('utf-8'))),
+        ]
+
+        for filename, expected_compression, data in param_list:
+            with self.subTest(filename=filename):
+                # Arrange
+                path: str = os.path.join(self.root, filename)
+
+                with open(path, mode='wb') as f:
+                    f.write(data)
+
+                # Act
+                with CompressionUtil.open_text(path, encoding='utf-8-sig') as f:
+                    actual: list[str] = f.readlines()
+
+                # Assert
+                self.assertEqual(expected_compression, CompressionUtil.detect(path))
+                self.assertListEqual(['[0000] fire\n', '[0001] wörd\n'], actual)
+
+    @unittest.skipIf(importlib.util.find_spec('zstandard') is not None, 'zstandard is installed')
+    def test_open_text_given_zstd_file_without_zstandard_raises_exception(self):
+        # Arrange
+        path: str = os.path.join(self.root, '1.trans.txt.zst')
+
+        with open(path, mode='wb') as f:
+            f.write(b'\x28\xb5\x2f\xfd')
+
+        # Assert
+        with self.assertRaises(Exception):
+            CompressionUtil.open_text(path, encoding='utf-8')
+
+    def test_strip_extension_only_removes_compression_extension(self):
+        param_list: list[tuple[str, str]] = [
+            # filename, expected
+            ('1.trans.txt.gz', '1.trans.txt'),
+            ('1.trans.txt.ZST', '1.trans.txt'),
+            ('1.trans.txt', '1.trans.txt'),
+        ]
+
+        for filename, expected in param_list:
+            with self.subTest(filename=filename):
+                # Act
+                actual: str = CompressionUtil.strip_extension(filename)
+
+                # Assert
+                self.assertEqual(expected, actual)
+
+
+if __name__ == '__main__':
+    unittest.main()
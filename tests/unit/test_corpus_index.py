@@ -0,0 +1,153 @@
+﻿import gzip
+import os
+import tempfile
+import unittest
+
+from src.kaldi_training_data_formatter import CorpusIndex
+from tests.case.corpus_builder import CorpusBuilder
+
+
+class TestCorpusIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root: str = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_scan_finds_transcript_in_each_chapter(self):
+        # Arrange
+        expected: set[str] = {
+            CorpusBuilder.create_transcript(self.root, 'user-1', 'project-1', 'chapter-1'),
+            CorpusBuilder.create_transcript(self.root, 'user-1', 'project-1', 'chapter-2'),
+            CorpusBuilder.create_transcript(self.root, 'user-2', 'project-2', 'chapter-1'),
+        }
+
+        # Act
+        class_under_test: CorpusIndex = CorpusIndex.from_root(self.root)
+
+        # Assert
+        self.assertSetEqual(expected, set(class_under_test.transcripts))
+
+    def test_scan_records_user_and_project_ids(self):
+        # Arrange
+        CorpusBuilder.create_transcript(self.root, 'user-1', 'project-1', 'chapter-1')
+        CorpusBuilder.create_transcript(self.root, 'user-2', 'project-2', 'chapter-1')
+
+        # Act
+        class_under_test: CorpusIndex = CorpusIndex.from_root(self.root)
+
+        # Assert
+        with self.subTest():
+            self.assertSetEqual({'user-1', 'user-2'}, class_under_test.user_ids)
+        with self.subTest():
+            self.assertSetEqual({'project-1', 'project-2'}, class_under_test.project_ids)
+
+    def test_scan_finds_transcripts_in_name_order(self):
+        # Arrange
+        expected: list[str] = sorted([
+            CorpusBuilder.create_transcript(self.root, 'b', 'q', 'y'),
+            CorpusBuilder.create_transcript(self.root, 'b', 'q', 'x'),
+            CorpusBuilder.create_transcript(self.root, 'a', 'r', 'z'),
+            CorpusBuilder.create_transcript(self.root, 'a', 'p', 'x'),
+            CorpusBuilder.create_transcript(self.root, 'c', 's', 'x'),
+        ])
+
+        for concurrency in [1, 4]:
+            with self.subTest(concurrency=concurrency):
+                # Act
+                actual: CorpusIndex = CorpusIndex.from_root(self.root, concurrency)
+
+                # Assert
+                self.assertListEqual(expected, actual.transcripts)
+
+    def test_scan_with_concurrency_matches_serial_order(self):
+        # Arrange
+        for user in range(3):
+            for project in range(2):
+                for chapter in range(4):
+                    CorpusBuilder.create_transcript(self.root,
+                                                    f'user-{user}',
+                                                    f'project-{user}-{project}',
+                                                    f'chapter-{chapter}')
+        os.makedirs(os.path.join(self.root, 'empty', 'nested'))
+        expected: CorpusIndex = CorpusIndex.from_root(self.root)
+
+        # Act
+        actual: CorpusIndex = CorpusIndex.from_root(self.root, concurrency=8)
+
+        # Assert
+        with self.subTest():
+            self.assertListEqual(expected.transcripts, actual.transcripts)
+        with self.subTest():
+            self.assertEqual(expected.directories_visited, actual.directories_visited)
+
+    def test_scan_finds_compressed_transcripts(self):
+        # Arrange
+        directory: str = os.path.join(self.root, 'user-1', 'project-1', 'chapter-1')
+        os.makedirs(directory)
+        expected: str = os.path.join(directory, 'chapter-1.trans.txt.gz')
+
+        with gzip.open(expected, mode='wt', encoding='utf-8') as f:
+            f.write('0000 hello world\n')
+
+        # Act
+        class_under_test: CorpusIndex = CorpusIndex.from_root(self.root)
+
+        # Assert
+        self.assertListEqual([expected], class_under_test.transcripts)
+
+    def test_scan_when_root_does_not_exist_raises_exception(self):
+        # Arrange
+        class_under_test: CorpusIndex = CorpusIndex(os.path.join(self.root, 'missing'))
+
+        # Assert
+        with self.assertRaises(Exception):
+            class_under_test.scan()
+
+    def test_shard_partitions_entries_by_project(self):
+        # Arrange
+        for user in range(4):
+            for project in range(3):
+                for chapter in range(2):
+                    CorpusBuilder.create_transcript(self.root,
+                                                    f'user-{user}',
+                                                    f'project-{user}-{project}',
+                                                    f'chapter-{chapter}')
+        class_under_test: CorpusIndex = CorpusIndex.from_root(self.root)
+
+        # Act
+        shards: list[CorpusIndex] = [class_under_test.shard(i, 3) for i in range(3)]
+
+        # Assert
+        with self.subTest():
+            self.assertCountEqual(class_under_test.transcripts, [path for s in shards for path in s.transcripts])
+        with self.subTest():
+            self.assertTrue(all(a.project_ids.isdisjoint(b.project_ids)
+                                for i, a in enumerate(shards) for b in shards[i + 1:]))
+        with self.subTest():
+            self.assertListEqual(shards[0].transcripts, class_under_test.shard(0, 3).transcripts)
+
+    def test_shard_when_shard_is_out_of_range_raises_exception(self):
+        # Arrange
+        class_under_test: CorpusIndex = CorpusIndex(self.root)
+
+        # Assert
+        with self.assertRaises(Exception):
+            class_under_test.shard(3, 3)
+
+    def test_subset_only_contains_entries_under_root(self):
+        # Arrange
+        expected: str = CorpusBuilder.create_transcript(self.root, 'user-1', 'project-1', 'chapter-1')
+        CorpusBuilder.create_transcript(self.root, 'user-2', 'project-2', 'chapter-1')
+        class_under_test: CorpusIndex = CorpusIndex.from_root(self.root)
+
+        # Act
+        actual: CorpusIndex = class_under_test.subset(os.path.join(self.root, 'user-1'))
+
+        # Assert
+        self.assertListEqual([expected], actual.transcripts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+﻿import os
+import tempfile
+import unittest
+import wave
+
+from src.kaldi_training_data_formatter import AudioMetadataIndex, CorpusIndex, DataDirWriter, FilesUtil
+
+
+class TestDataDirWriter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root: str = os.path.join(self.temp_dir.name, 'audio')
+        self.output_dir: str = os.path.join(self.temp_dir.name, 'data', 'train')
+
+        for user_id, chapter_id, text in [
+            ('b', '2', '[0001] Start the fire\n[0000] fire light\n'),
+            ('a', '1', '[0000] never ever\n[0002] missing audio\n'),
+        ]:
+            directory: str = os.path.join(self.root, user_id, 'project', chapter_id)
+            os.makedirs(directory)
+
+            with open(os.path.join(directory, f'{chapter_id}.trans.txt'), mode='w', encoding='utf-8') as f:
+                f.write(text)
+
+            for utterance in ['0000', '0001']:
+                open(os.path.join(directory, f'{user_id}-{chapter_id}-{utterance}.flac'), mode='wb').close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_write_creates_sorted_kaldi_files(self):
+        # Arrange
+        expected: dict[str, list[str]] = {
+            DataDirWriter.TEXT_FILENAME: ['a-1-0000 never ever', 'b-2-0000 fire light', 'b-2-0001 start the fire'],
+            DataDirWriter.UTT2SPK_FILENAME: ['a-1-0000 a', 'b-2-0000 b', 'b-2-0001 b'],
+            DataDirWriter.SPK2UTT_FILENAME: ['a a-1-0000', 'b b-2-0000 b-2-0001'],
+        }
+        class_under_test: DataDirWriter = DataDirWriter(self.output_dir, max_lines=1)
+
+        # Act
+        actual_count: int = class_under_test.write(CorpusIndex.from_root(self.root))
+
+        # Assert
+        with self.subTest():
+            self.assertEqual(3, actual_count)
+
+        for filename, expected_lines in expected.items():
+            with self.subTest(filename=filename):
+                with open(os.path.join(self.output_dir, filename), mode='r', encoding='utf-8') as f:
+                    self.assertListEqual(expected_lines, f.read().splitlines())
+
+    def test_write_creates_wav_scp_with_flac_commands(self):
+        # Arrange
+        class_under_test: DataDirWriter = DataDirWriter(self.output_dir)
+
+        # Act
+        class_under_test.write(CorpusIndex.from_root(self.root))
+
+        # Assert
+        with open(os.path.join(self.output_dir, DataDirWriter.WAV_SCP_FILENAME), mode='r', encoding='utf-8') as f:
+            lines: list[str] = f.read().splitlines()
+
+        with self.subTest():
+            self.assertListEqual(['a-1-0000', 'b-2-0000', 'b-2-0001'], [line.split(' ')[0] for line in lines])
+        with self.subTest():
+            self.assertTrue(all(line.split(' ', 1)[1].startswith('flac -c -d -s ') for line in lines))
+
+    def test_write_quotes_audio_paths_with_spaces(self):
+        # Arrange
+        root: str = os.path.join(self.temp_dir.name, 'my audio')
+        os.rename(self.root, root)
+        directory: str = os.path.join(root, 'a', 'project', '1')
+        os.rename(os.path.join(directory, 'a-1-0000.flac'), os.path.join(directory, 'a-1-0000.wav'))
+        expected: list[str] = [
+            f"a-1-0000 cat '{os.path.join(directory, 'a-1-0000.wav')}' |",
+            f"b-2-0000 flac -c -d -s '{os.path.join(root, 'b', 'project', '2', 'b-2-0000.flac')}' |",
+        ]
+        class_under_test: DataDirWriter = DataDirWriter(self.output_dir)
+
+        # Act
+        class_under_test.write(CorpusIndex.from_root(root))
+
+        # Assert
+        with open(os.path.join(self.output_dir, DataDirWriter.WAV_SCP_FILENAME), mode='r', encoding='utf-8') as f:
+            self.assertListEqual(expected, f.read().splitlines()[:2])
+
+    def test_write_with_audio_index_creates_utt2dur(self):
+        # Arrange
+        for user_id, chapter_id, utterance, frame_count in [('a', '1', '0000', 24000),
+                                                            ('b', '2', '0000', 8000),
+                                                            ('b', '2', '0001', 16000)]:
+            self.__replace_with_wav(user_id, chapter_id, utterance, frame_count)
+
+        index: CorpusIndex = CorpusIndex.from_root(self.root)
+        class_under_test: DataDirWriter = DataDirWriter(self.output_dir, audio_index=self.__create_audio_index(index))
+
+        # Act
+        class_under_test.write(index)
+
+        # Assert
+        with open(os.path.join(self.output_dir, DataDirWriter.UTT2DUR_FILENAME), mode='r', encoding='utf-8') as f:
+            self.assertListEqual(['a-1-0000 1.500', 'b-2-0000 0.500', 'b-2-0001 1.000'], f.read().splitlines())
+
+    def test_write_when_a_duration_is_missing_removes_utt2dur(self):
+        # Arrange
+        self.__replace_with_wav('a', '1', '0000', 24000)  # The other utterances keep their empty, unreadable files
+        os.makedirs(self.output_dir)
+
+        with open(os.path.join(self.output_dir, DataDirWriter.UTT2DUR_FILENAME), mode='w', encoding='utf-8') as f:
+            f.write('a-1-0000 9.000\n')
+
+        index: CorpusIndex = CorpusIndex.from_root(self.root)
+        class_under_test: DataDirWriter = DataDirWriter(self.output_dir, audio_index=self.__create_audio_index(index))
+
+        # Act
+        class_under_test.write(index)
+
+        # Assert
+        with self.subTest():
+            self.assertFalse(os.path.exists(os.path.join(self.output_dir, DataDirWriter.UTT2DUR_FILENAME)))
+        with self.subTest():
+            self.assertTrue(os.path.isfile(os.path.join(self.output_dir, DataDirWriter.UTT2SPK_FILENAME)))
+
+    def __create_audio_index(self, index: CorpusIndex) -> AudioMetadataIndex:
+        audio_index: AudioMetadataIndex = AudioMetadataIndex(self.root)
+        audio_index.update(path for entry in index for path in FilesUtil.get_audio_files(entry.directory).values())
+
+        return audio_index
+
+    def __replace_with_wav(self, user_id: str, chapter_id: str, utterance: str, frame_count: int) -> None:
+        directory: str = os.path.join(self.root, user_id, 'project', chapter_id)
+        os.remove(os.path.join(directory, f'{user_id}-{chapter_id}-{utterance}.flac'))
+
+        with wave.open(os.path.join(directory, f'{user_id}-{chapter_id}-{utterance}.wav'), mode='wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(16000)
+            f.writeframes(bytes(2 * frame_count))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+﻿import tempfile
+import unittest
+
+from src.kaldi_training_data_formatter import CorpusIndex, DuplicateDetector
+from tests.case.corpus_builder import CorpusBuilder
+
+
+class TestDuplicateDetector(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root: str = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_find_duplicates_reports_every_location(self):
+        param_list: list[tuple[str, int]] = [
+            # name, bloom_filter_threshold
+            ('exact', DuplicateDetector.BLOOM_FILTER_THRESHOLD),
+            ('bloom filter', 0),
+        ]
+        first: str = CorpusBuilder.create_transcript(self.root,
+                                                     'user',
+                                                     'project-1',
+                                                     '1',
+                                                     '[0000] fire\n\n[0001] light\n')
+        second: str = CorpusBuilder.create_transcript(self.root, 'user', 'project-2', '1', '[0001] light\n[0002] the\n')
+        CorpusBuilder.create_transcript(self.root, 'other', 'project-3', '1', '[0001] light\n')
+        expected: dict[str, list[tuple[str, int]]] = {'user-1-0001': [(first, 3), (second, 1)]}
+
+        for name, bloom_filter_threshold in param_list:
+            with self.subTest(name=name):
+                # Arrange
+                class_under_test: DuplicateDetector = DuplicateDetector(bloom_filter_threshold)
+
+                # Act
+                actual: dict[str, list[tuple[str, int]]] = class_under_test.find_duplicates(
+                    CorpusIndex.from_root(self.root))
+
+                # Assert
+                self.assertDictEqual(expected, {k: sorted(v) for k, v in actual.items()})
+
+    def test_find_duplicates_when_ids_are_unique_returns_empty(self):
+        # Arrange
+        CorpusBuilder.create_transcript(self.root, 'user', 'project-1', '1', '[0000] fire\n[0001] light\n')
+        CorpusBuilder.create_transcript(self.root, 'user', 'project-1', '2', '[0000] fire\n[0001] light\n')
+        class_under_test: DuplicateDetector = DuplicateDetector(0)
+
+        # Act
+        actual: dict[str, list[tuple[str, int]]] = class_under_test.find_duplicates(CorpusIndex.from_root(self.root))
+
+        # Assert
+        self.assertDictEqual({}, actual)
+
+
+if __name__ == '__main__':
+    unittest.main()
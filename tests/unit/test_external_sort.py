@@ -0,0 +1,44 @@
+﻿import unittest
+from typing import Tuple
+
+from src.kaldi_training_data_formatter import ExternalSorter, SortOrder
+
+
+class TestExternalSorter(unittest.TestCase):
+    def test_sorted_lines_returns_expected(self):
+        param_list: list[Tuple[int | None, SortOrder]] = [
+            # max_lines, order
+            (None, SortOrder.CodePoint),
+            (2, SortOrder.CodePoint),
+            (2, SortOrder.CLocale),
+            (100, SortOrder.CLocale),
+        ]
+        lines: list[str] = ['fire', 'light', 'émeute', 'a', 'zebra', 'the', 'fire', 'Ångström', '']
+
+        for max_lines, order in param_list:
+            with self.subTest(max_lines=max_lines, order=order):
+                # Arrange
+                expected: list[str] = sorted(lines, key=lambda line: line.encode('utf-8'))
+
+                with ExternalSorter(max_lines, order=order) as class_under_test:
+                    for line in lines:
+                        class_under_test.add(line)
+
+                    # Act
+                    actual: list[str] = list(class_under_test.sorted_lines())
+
+                # Assert
+                self.assertListEqual(expected, actual)
+
+    def test_add_when_max_lines_is_reached_spills_runs(self):
+        with ExternalSorter(2) as class_under_test:
+            # Act
+            for line in ['c', 'b', 'a', 'd', 'e']:
+                class_under_test.add(line)
+
+            # Assert
+            self.assertEqual(2, class_under_test.run_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+﻿import os
+import tempfile
+import unittest
+from typing import Tuple
+
+from src.kaldi_training_data_formatter import CorpusIndex, FilesUtil
+
+
+class TestFilesUtil(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root: str = self.temp_dir.name
+        self.chapter_path: str = os.path.join(self.root, 'user', 'project', 'chapter')
+        os.makedirs(self.chapter_path)
+
+        with open(os.path.join(self.chapter_path, 'chapter.trans.txt'), mode='w', encoding='utf-8') as f:
+            f.write('[0000] fire fire light the fire\n[0001] start the fire\n')
+
+        for filename in ['[0000].wav', '0001.flac']:
+            open(os.path.join(self.chapter_path, filename), mode='wb').close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_find_audio_files_lists_audio_in_every_chapter(self):
+        # Arrange
+        other_chapter_path: str = os.path.join(self.root, 'user', 'project', 'other')
+        os.makedirs(other_chapter_path)
+
+        with open(os.path.join(other_chapter_path, 'other.trans.txt'), mode='w', encoding='utf-8') as f:
+            f.write('[0000] fire\n')
+
+        open(os.path.join(other_chapter_path, '0000.mp3'), mode='wb').close()
+        expected: list[str] = [os.path.join(self.chapter_path, '0001.flac'),
+                               os.path.join(self.chapter_path, '[0000].wav'),
+                               os.path.join(other_chapter_path, '0000.mp3')]
+
+        # Act
+        actual: list[str] = FilesUtil.find_audio_files(CorpusIndex.from_root(self.root), jobs=2)
+
+        # Assert
+        self.assertCountEqual(expected, actual)
+
+    def test_format_audio_files_renames_audio_to_utterance_ids(self):
+        # Arrange
+        expected: list[str] = ['chapter.trans.txt', 'user-chapter-0000.wav', 'user-chapter-0001.flac']
+
+        # Act
+        FilesUtil.format_audio_files(self.root, jobs=2)
+
+        # Assert
+        self.assertListEqual(expected, sorted(os.listdir(self.chapter_path)))
+
+    def test_format_audio_files_when_run_twice_does_nothing_the_second_time(self):
+        # Arrange
+        FilesUtil.format_audio_files(self.root)
+
+        # Act
+        actual: list[Tuple[str, str]] = FilesUtil.format_audio_files(self.root)
+
+        # Assert
+        self.assertListEqual([], actual)
+
+    def test_format_audio_files_when_rename_fails_returns_completed_renames(self):
+        # Arrange
+        os.mkdir(os.path.join(self.chapter_path, 'user-chapter-0001.flac'))  # Renaming a file onto it fails
+        expected: list[Tuple[str, str]] = [(os.path.join(self.chapter_path, '[0000].wav'),
+                                            os.path.join(self.chapter_path, 'user-chapter-0000.wav'))]
+
+        # Act
+        actual: list[Tuple[str, str]] = FilesUtil.format_audio_files(self.root)
+
+        # Assert
+        with self.subTest():
+            self.assertListEqual(expected, actual)
+        with self.subTest():
+            self.assertTrue(os.path.isfile(os.path.join(self.chapter_path, '0001.flac')))
+
+    def test_format_audio_files_given_dry_run_does_not_rename_files(self):
+        # Arrange
+        expected: list[str] = sorted(os.listdir(self.chapter_path))
+
+        # Act
+        operations: list[Tuple[str, str]] = FilesUtil.format_audio_files(self.root, dry_run=True)
+
+        # Assert
+        with self.subTest():
+            self.assertEqual(2, len(operations))
+        with self.subTest():
+            self.assertListEqual(expected, sorted(os.listdir(self.chapter_path)))
+
+
+if __name__ == '__main__':
+    unittest.main()
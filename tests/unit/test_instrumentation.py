@@ -0,0 +1,89 @@
+﻿import json
+import os
+import tempfile
+import unittest
+
+from src.kaldi_training_data_formatter import Instrumentation, NullStage, StageMetrics
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_stage_when_disabled_returns_null_stage(self):
+        # Arrange
+        class_under_test: Instrumentation = Instrumentation(False)
+
+        # Act
+        with class_under_test.stage('read_vocabulary') as stage:
+            stage.add('lines_parsed', 10)
+
+        # Assert
+        with self.subTest():
+            self.assertIsInstance(stage, NullStage)
+        with self.subTest():
+            self.assertListEqual([], class_under_test.stages)
+
+    def test_stage_accumulates_counters(self):
+        # Arrange
+        class_under_test: Instrumentation = Instrumentation()
+
+        # Act
+        with class_under_test.stage('read_vocabulary') as stage:
+            stage.add('lines_parsed', 10)
+            stage.add('lines_parsed', 5)
+            stage.add('transcripts_parsed')
+
+        # Assert
+        metrics: StageMetrics = class_under_test.stages[0]
+
+        with self.subTest():
+            self.assertDictEqual({'lines_parsed': 15, 'transcripts_parsed': 1}, metrics.counters)
+        with self.subTest():
+            self.assertGreaterEqual(metrics.wall_time, 0.0)
+
+    def test_write_json_writes_every_stage(self):
+        # Arrange
+        path: str = os.path.join(self.temp_dir.name, 'metrics.json')
+        class_under_test: Instrumentation = Instrumentation()
+
+        with class_under_test.stage('read_vocabulary') as stage:
+            stage.add('lines_parsed', 3)
+        with class_under_test.stage('save_vocabulary'):
+            pass
+
+        # Act
+        class_under_test.write_json(path)
+
+        # Assert
+        with open(path, mode='r', encoding='utf-8') as f:
+            actual: dict = json.load(f)
+
+        with self.subTest():
+            self.assertListEqual(['read_vocabulary', 'save_vocabulary'], [stage['stage'] for stage in actual['stages']])
+        with self.subTest():
+            self.assertDictEqual({'lines_parsed': 3}, actual['stages'][0]['counters'])
+
+    def test_write_prometheus_writes_labeled_samples(self):
+        # Arrange
+        path: str = os.path.join(self.temp_dir.name, 'metrics.prom')
+        class_under_test: Instrumentation = Instrumentation()
+
+        with class_under_test.stage('read_vocabulary') as stage:
+            stage.add('lines_parsed', 3)
+
+        # Act
+        class_under_test.write_prometheus(path)
+
+        # Assert
+        with open(path, mode='r', encoding='utf-8') as f:
+            actual: list[str] = f.read().splitlines()
+
+        self.assertIn('ktdf_stage_lines_parsed{stage="read_vocabulary"} 3', actual)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+﻿import os
+import tempfile
+import unittest
+from typing import Any
+
+from src.kaldi_training_data_formatter import JsonManifest
+
+
+class TestJsonManifest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path: str = os.path.join(self.temp_dir.name, 'cache', 'manifest.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_load_returns_files_written_by_save(self):
+        # Arrange
+        expected: dict[str, Any] = {'a/b.txt': {'size': 3, 'counts': {'hello': 1}}}
+        class_under_test: JsonManifest = JsonManifest(self.path, 1)
+        class_under_test.save(expected)
+
+        # Act
+        actual: dict[str, Any] = class_under_test.load()
+
+        # Assert
+        with self.subTest():
+            self.assertDictEqual(expected, actual)
+        with self.subTest():
+            self.assertListEqual(['manifest.json'], os.listdir(os.path.dirname(self.path)))
+
+    def test_load_discards_files_from_another_version(self):
+        # Arrange
+        JsonManifest(self.path, 1).save({'a/b.txt': {}})
+        class_under_test: JsonManifest = JsonManifest(self.path, 2)
+
+        # Act
+        actual: dict[str, Any] = class_under_test.load()
+
+        # Assert
+        self.assertDictEqual({}, actual)
+
+    def test_load_when_file_does_not_exist_returns_empty_files(self):
+        # Arrange
+        class_under_test: JsonManifest = JsonManifest(self.path, 1)
+
+        # Act
+        actual: dict[str, Any] = class_under_test.load()
+
+        # Assert
+        self.assertDictEqual({}, actual)
+
+
+if __name__ == '__main__':
+    unittest.main()
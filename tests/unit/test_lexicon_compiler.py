@@ -1,8 +1,9 @@
 ﻿import os
+import tempfile
 import unittest
 from typing import Tuple
 
-from src.kaldi_training_data_formatter import LexiconCompiler
+from src.kaldi_training_data_formatter import LexiconCompiler, LexiconIndex, SortOrder
 from tests.case.file_test_case import FileTestCase
 
 
@@ -147,6 +148,55 @@ class TestLexiconCompiler(FileTestCase):
                                      open(actual_path, mode='r', encoding='utf-8-sig'),
                                      'Assert that lexicon in actual file equals expected file')
 
+    def test_compile_lexicon_given_lexicon_index_has_same_lexicon_as_text_import(self):
+        with tempfile.TemporaryDirectory() as root:
+            # Arrange
+            vocabulary: list[str] = ['a', 'and', 'fire', 'missing']
+            import_path: str = os.path.join(self.__class__.input_path, 'test-import-lexicon.txt')
+            LexiconIndex.compile(import_path, os.path.join(root, 'lexicon.idx'))
+            expected: LexiconCompiler = LexiconCompiler(self.__class__.input_path,
+                                                        root,
+                                                        import_name='test-import-lexicon.txt')
+            expected.compile_lexicon(vocabulary)
+            class_under_test: LexiconCompiler = LexiconCompiler(root, root, import_name='lexicon.idx')
+
+            # Act
+            class_under_test.compile_lexicon(vocabulary)
+
+            # Assert
+            self.assertDictEqual(dict(expected.lexicon), dict(class_under_test.lexicon))
+
+    def test_save_lexicon_given_max_sort_lines_creates_expected_output_file(self):
+        param_list: list[SortOrder] = [
+            # sort_order
+            SortOrder.CodePoint,
+            SortOrder.CLocale,
+        ]
+
+        for sort_order in param_list:
+            with self.subTest(sort_order=sort_order), tempfile.TemporaryDirectory() as output_path:
+                # Arrange
+                expected_path: str = os.path.join(self.__class__.resources_path, 'expected-lexicon-1.txt')
+                actual_path: str = os.path.join(output_path, LexiconCompiler.LEXICON_FILENAME)
+                class_under_test: LexiconCompiler = LexiconCompiler(self.__class__.input_path,
+                                                                    output_path,
+                                                                    import_name='test-import-lexicon.txt',
+                                                                    max_sort_lines=5,
+                                                                    sort_order=sort_order)
+
+                with open(os.path.join(self.__class__.resources_path, 'expected-vocab.txt'),
+                          mode='r',
+                          encoding='utf-8-sig') as f:
+                    class_under_test.compile_lexicon(f.read().split())
+
+                # Act
+                class_under_test.save_lexicon()
+
+                # Assert
+                self.assertFileEqual(open(expected_path, mode='r', encoding='utf-8-sig'),
+                                     open(actual_path, mode='r', encoding='utf-8-sig'),
+                                     'Assert that lexicon in actual file equals expected file')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,61 @@
+﻿import os
+import tempfile
+import unittest
+from typing import Tuple
+
+from src.kaldi_training_data_formatter import LexiconIndex
+
+
+class TestLexiconIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.resources_path: str = os.path.join(os.getcwd(), 'resources')
+        cls.input_path: str = os.path.join(cls.resources_path, 'input')
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index_path: str = os.path.join(self.temp_dir.name, 'lexicon.idx')
+        LexiconIndex.compile(os.path.join(self.__class__.input_path, 'test-import-lexicon.txt'), self.index_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_is_index_given_compiled_index_returns_true(self):
+        # Act
+        actual: bool = LexiconIndex.is_index(self.index_path)
+
+        # Assert
+        self.assertTrue(actual)
+
+    def test_is_index_given_text_lexicon_returns_false(self):
+        # Arrange
+        path: str = os.path.join(self.__class__.input_path, 'test-import-lexicon.txt')
+
+        # Act
+        actual: bool = LexiconIndex.is_index(path)
+
+        # Assert
+        self.assertFalse(actual)
+
+    def test_lookup_returns_expected(self):
+        param_list: list[Tuple[str, set[str] | None]] = [
+            # word, expected
+            ('a', {'AH0', 'EY1'}),
+            ('and', {'AE1 N D', 'AH0 N D'}),
+            ('you', {'Y UW1'}),
+            ('missing', None),
+            ('', None),
+        ]
+
+        with LexiconIndex(self.index_path) as class_under_test:
+            for word, expected in param_list:
+                with self.subTest():
+                    # Act
+                    actual: set[str] | None = class_under_test.lookup(word)
+
+                    # Assert
+                    self.assertEqual(expected, actual)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+﻿import gzip
+import os
+import tempfile
+import unittest
+
+from src.kaldi_training_data_formatter import LexiconReader, PhoneLexicon, ReaderBackend
+
+
+class TestLexiconReader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path: str = os.path.join(self.temp_dir.name, 'lexicon.txt')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_read_lexicon_normalizes_case_and_white_space(self):
+        # Arrange
+        self.__write_lexicon('FIRE\tF AY1 ER0\r\n  fire  f  ay1  r \nLight L AY1 T\n')
+        expected: dict[str, set[str]] = {
+            'fire': {'F AY1 ER0', 'F AY1 R'},
+            'light': {'L AY1 T'},
+        }
+        actual: PhoneLexicon = PhoneLexicon()
+
+        # Act
+        with LexiconReader(self.path) as class_under_test:
+            class_under_test.read_lexicon(actual)
+
+        # Assert
+        self.assertDictEqual(expected, dict(actual))
+
+    def test_read_lexicon_with_mmap_backend_matches_stream_backend(self):
+        # Arrange
+        line_count: int = LexiconReader.BUFFER_SIZE // 16  # Spans more than one batch
+        self.__write_lexicon('\ufeff' + ''.join(f'wörd{i} W ER1 D\r\n' for i in range(line_count)) + 'last L AE1 S T')
+        expected: PhoneLexicon = PhoneLexicon()
+        actual: PhoneLexicon = PhoneLexicon()
+
+        with LexiconReader(self.path) as reader:
+            reader.read_lexicon(expected)
+
+        # Act
+        with LexiconReader(self.path, ReaderBackend.Mmap) as class_under_test:
+            class_under_test.read_lexicon(actual)
+
+        # Assert
+        with self.subTest():
+            self.assertEqual(line_count + 1, len(actual))
+        with self.subTest():
+            self.assertDictEqual(dict(expected), dict(actual))
+
+    def test_read_lexicon_with_mmap_backend_streams_compressed_file(self):
+        # Arrange
+        path: str = os.path.join(self.temp_dir.name, 'lexicon.txt.gz')
+
+        with gzip.open(path, mode='wt', encoding='utf-8') as f:
+            f.write('FIRE F AY1 ER0\n')
+
+        actual: PhoneLexicon = PhoneLexicon()
+
+        # Act
+        with LexiconReader(path, ReaderBackend.Mmap) as class_under_test:
+            class_under_test.read_lexicon(actual)
+
+        # Assert
+        self.assertDictEqual({'fire': {'F AY1 ER0'}}, dict(actual))
+
+    def test_read_lexicon_skips_lines_with_too_few_elements(self):
+        # Arrange
+        self.__write_lexicon('fire\n\nlight L AY1 T\n')
+        actual: PhoneLexicon = PhoneLexicon()
+
+        # Act
+        with LexiconReader(self.path) as class_under_test:
+            class_under_test.read_lexicon(actual)
+
+        # Assert
+        self.assertDictEqual({'light': {'L AY1 T'}}, dict(actual))
+
+    def test_read_lexicon_given_vocabulary_only_keeps_vocabulary_words(self):
+        # Arrange
+        self.__write_lexicon('fire F AY1 ER0\nlight L AY1 T\nstart S T AA1 R T\n')
+        actual: PhoneLexicon = PhoneLexicon()
+
+        # Act
+        with LexiconReader(self.path) as class_under_test:
+            class_under_test.read_lexicon(actual, {'fire', 'start', 'missing'})
+
+        # Assert
+        self.assertDictEqual({'fire': {'F AY1 ER0'}, 'start': {'S T AA1 R T'}}, dict(actual))
+
+    def __write_lexicon(self, text: str) -> None:
+        with open(self.path, mode='w', encoding='utf-8', newline='') as f:
+            f.write(text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+﻿import unittest
+
+from src.kaldi_training_data_formatter import PhoneLexicon
+
+
+class TestPhoneLexicon(unittest.TestCase):
+    def setUp(self):
+        self.class_under_test: PhoneLexicon = PhoneLexicon()
+
+    def test_add_deduplicates_pronunciations_of_word(self):
+        # Act
+        self.class_under_test.add('a', ['AH0'])
+        self.class_under_test.add('a', ['EY1'])
+        self.class_under_test.add('a', ['AH0'])
+
+        # Assert
+        self.assertSetEqual({'AH0', 'EY1'}, self.class_under_test['a'])
+
+    def test_add_shares_pronunciations_and_phones_between_words(self):
+        # Act
+        self.class_under_test.add('lead', ['L', 'EH1', 'D'])
+        self.class_under_test.add('led', ['L', 'EH1', 'D'])
+
+        # Assert
+        with self.subTest():
+            self.assertEqual(1, self.class_under_test.pronunciation_count)
+        with self.subTest():
+            self.assertListEqual(['L', 'EH1', 'D'], self.class_under_test.phones)
+        with self.subTest():
+            self.assertIs(self.class_under_test.get_pronunciations('lead')[0],
+                          self.class_under_test.get_pronunciations('led')[0])
+
+    def test_add_word_keeps_existing_pronunciations(self):
+        # Arrange
+        self.class_under_test.add('fire', ['F', 'AY1', 'ER0'])
+
+        # Act
+        self.class_under_test.add_word('fire')
+        self.class_under_test.add_word('light')
+
+        # Assert
+        self.assertDictEqual({'fire': {'F AY1 ER0'}, 'light': set()}, dict(self.class_under_test))
+
+
+if __name__ == '__main__':
+    unittest.main()
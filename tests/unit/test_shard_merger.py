@@ -0,0 +1,100 @@
+﻿import os
+import tempfile
+import unittest
+
+from src.kaldi_training_data_formatter import LexiconCompiler, ShardMerger
+
+
+class TestShardMerger(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root: str = self.temp_dir.name
+        self.class_under_test: ShardMerger = ShardMerger(self.root)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_get_shard_filename_inserts_shard_before_extension(self):
+        # Arrange
+        param_list: list[tuple[str, str]] = [
+            ('vocab.txt', 'vocab.2-of-8.txt'),
+            ('data', 'data.2-of-8'),
+        ]
+
+        for filename, expected in param_list:
+            with self.subTest(filename=filename):
+                # Act
+                actual: str = ShardMerger.get_shard_filename(filename, 2, 8)
+
+                # Assert
+                self.assertEqual(expected, actual)
+
+    def test_find_shard_files_returns_paths_in_shard_order(self):
+        # Arrange
+        self.__write_file('vocab-counts.1-of-2.txt', [])
+        self.__write_file('vocab-counts.0-of-2.txt', [])
+        expected: list[str] = [os.path.join(self.root, 'vocab-counts.0-of-2.txt'),
+                               os.path.join(self.root, 'vocab-counts.1-of-2.txt')]
+
+        # Act
+        actual: list[str] = self.class_under_test.find_shard_files('vocab-counts.txt')
+
+        # Assert
+        self.assertListEqual(expected, actual)
+
+    def test_find_shard_files_when_shard_is_missing_raises_exception(self):
+        # Arrange
+        self.__write_file('vocab-counts.0-of-3.txt', [])
+        self.__write_file('vocab-counts.2-of-3.txt', [])
+
+        # Assert
+        with self.assertRaises(Exception):
+            self.class_under_test.find_shard_files('vocab-counts.txt')
+
+    def test_merge_vocabulary_writes_sorted_unique_words(self):
+        # Arrange
+        paths: list[str] = [
+            self.__write_file('vocab-counts.0-of-2.txt', ['apple 2', 'cherry 1', 'dream 4']),
+            self.__write_file('vocab-counts.1-of-2.txt', ['banana 1', 'cherry 3']),
+        ]
+
+        # Act
+        word_count: int = self.class_under_test.merge_vocabulary(paths, 'vocab.txt')
+
+        # Assert
+        with self.subTest():
+            self.assertEqual(4, word_count)
+        with self.subTest():
+            self.assertListEqual(['apple', 'banana', 'cherry', 'dream'], self.__read_file('vocab.txt'))
+
+    def test_merge_lexicon_drops_placeholder_when_another_shard_has_phones(self):
+        # Arrange
+        paths: list[str] = [
+            self.__write_file('lexicon.0-of-2.txt', [f'apple {LexiconCompiler.NO_PHONES}', 'cherry CH EH R IY']),
+            self.__write_file('lexicon.1-of-2.txt', ['apple AE P AH L', 'cherry CH EH R IY']),
+        ]
+
+        # Act
+        line_count: int = self.class_under_test.merge_lexicon(paths, 'lexicon.txt')
+
+        # Assert
+        with self.subTest():
+            self.assertEqual(2, line_count)
+        with self.subTest():
+            self.assertListEqual(['apple AE P AH L', 'cherry CH EH R IY'], self.__read_file('lexicon.txt'))
+
+    def __read_file(self, filename: str) -> list[str]:
+        with open(os.path.join(self.root, filename), mode='r', encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def __write_file(self, filename: str, lines: list[str]) -> str:
+        path: str = os.path.join(self.root, filename)
+
+        with open(path, mode='w', encoding='utf-8') as f:
+            f.writelines(line + '\n' for line in lines)
+
+        return path
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+﻿import os
+import pstats
+import tempfile
+import unittest
+
+from src.kaldi_training_data_formatter import Instrumentation, ProfileMode, StageProfiler
+
+
+class TestStageProfiler(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root: str = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_stop_with_cpu_mode_writes_profile_labeled_by_stage(self):
+        # Arrange
+        class_under_test: StageProfiler = StageProfiler(ProfileMode.Cpu, self.root)
+        class_under_test.start('read_vocabulary')
+        sorted(str(i) for i in range(1000))
+
+        # Act
+        actual: str = class_under_test.stop('read_vocabulary')
+
+        # Assert
+        with self.subTest():
+            self.assertEqual(os.path.join(self.root, 'ktdf-profile-read_vocabulary.prof'), actual)
+        with self.subTest():
+            self.assertGreater(pstats.Stats(actual).total_calls, 0)
+
+    def test_stop_with_memory_mode_writes_allocation_report(self):
+        # Arrange
+        class_under_test: StageProfiler = StageProfiler(ProfileMode.Memory, self.root)
+        class_under_test.start('compile_lexicon')
+        held: list[str] = [str(i) for i in range(1000)]
+
+        # Act
+        actual: str = class_under_test.stop('compile_lexicon')
+
+        # Assert
+        with open(actual, mode='r', encoding='utf-8') as f:
+            self.assertEqual('Stage: compile_lexicon\n', f.readline())
+
+        self.assertEqual(1000, len(held))
+
+    def test_instrumentation_with_profiler_profiles_each_stage(self):
+        # Arrange
+        profiler: StageProfiler = StageProfiler(ProfileMode.Cpu, self.root)
+        class_under_test: Instrumentation = Instrumentation(False, profiler)
+
+        # Act
+        with class_under_test.stage('scan'):
+            pass
+        with class_under_test.stage('save_lexicon'):
+            pass
+
+        # Assert
+        self.assertListEqual(['ktdf-profile-save_lexicon.prof', 'ktdf-profile-scan.prof'], sorted(os.listdir(self.root)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -109,6 +109,29 @@ class TestTranscriptLine(unittest.TestCase):
                 with self.subTest():
                     self.assertListEqual(expected_text, actual.text, 'Actual text does not equal expected')
 
+    def test_parse_block_returns_same_lines_as_from_line(self):
+        param_list: list[str] = [
+            # block
+            '0\n0 hello world\n',
+            '  0 hello world  \r\n\n   \n1 fire  light',
+            '0 h\u00e9llo\tworld\n1  \x1cfire \n',
+        ]
+
+        for block in param_list:
+            with self.subTest():
+                # Arrange
+                expected: list[TranscriptLine] = [
+                    TranscriptLine.from_line(line)
+                    for line in block.split('\n')
+                    if line.strip('\n\r ')
+                ]
+
+                # Act
+                line_ids, texts = TranscriptLine.parse_block(block)
+
+                # Assert
+                self.assertListEqual(expected, [TranscriptLine(i, t) for i, t in zip(line_ids, texts)])
+
     def test_str_returns_expected(self):
         param_list: list[Tuple[str, list[str], str]] = [
             # (line_)id, text, expected
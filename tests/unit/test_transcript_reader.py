@@ -1,7 +1,8 @@
 ﻿import os.path
+import tempfile
 import unittest
 
-from src.kaldi_training_data_formatter import TranscriptReader, TranscriptLine
+from src.kaldi_training_data_formatter import ReaderBackend, TranscriptReader, TranscriptLine
 
 
 class TestTranscriptReader(unittest.TestCase):
@@ -36,6 +37,81 @@ class TestTranscriptReader(unittest.TestCase):
                     # Assert
                     self.assertListEqual(expected, actual)
 
+    def test_iter_yields_transcript_lines_in_order(self):
+        # Arrange
+        path: str = TestTranscriptReader.__create_path('test-transcript.trans.txt')
+        expected: list[TranscriptLine] = [
+            TranscriptLine.from_line('[0000] fire fire light the fire'),
+            TranscriptLine.from_line('[0001] brighter higher as you desire'),
+            TranscriptLine.from_line('[0002] chasing all that we aspire'),
+            TranscriptLine.from_line('[0003] spreading out like wildfire'),
+            TranscriptLine.from_line('[0004] never ever have i ever'),
+            TranscriptLine.from_line('[0005] been a sinner been a dreamer'),
+            TranscriptLine.from_line('[0006] take the chance and with my lighter'),
+            TranscriptLine.from_line('[0007] start the fire'),
+        ]
+
+        with TranscriptReader(path) as class_under_test:
+            # Act
+            actual: list[TranscriptLine] = [line for line in class_under_test]
+
+            # Assert
+            self.assertListEqual(expected, actual)
+
+    def test_iter_numbered_yields_line_numbers_from_one(self):
+        # Arrange
+        path: str = TestTranscriptReader.__create_path('test-transcript.trans.txt')
+
+        with TranscriptReader(path) as class_under_test:
+            # Act
+            actual: list[tuple[int, str]] = [(number, line.id) for number, line in class_under_test.iter_numbered()]
+
+            # Assert
+            self.assertListEqual([(i + 1, f'[{i:04d}]') for i in range(8)], actual)
+
+    def test_mmap_backend_reads_same_lines_and_line_numbers_as_stream(self):
+        with open(TestTranscriptReader.__create_path('test-transcript.trans.txt'), mode='rb') as f:
+            transcript: bytes = f.read()
+
+        param_list: list[tuple[str, bytes]] = [
+            # name, content
+            ('transcript', transcript),
+            ('bom, blank lines and no final new-line', '\ufeff[0000] fire\r\n\n  \n[0001] héllo wörld'.encode()),
+            ('empty', b''),
+            ('cr only line endings', b'[0000] fire\r[0001] light\r'),
+            ('mixed line endings', b'[0000] fire\r[0001] light\r\n[0002] the\n[0003] fire'),
+            ('cr before crlf', b'[0000] fire\r\r\n[0001] light\n'),
+        ]
+
+        for name, content in param_list:
+            with self.subTest(name=name), tempfile.TemporaryDirectory() as directory:
+                # Arrange
+                path: str = os.path.join(directory, 'test.trans.txt')
+
+                with open(path, mode='wb') as f:
+                    f.write(content)
+
+                with TranscriptReader(path) as reader:
+                    expected: list[tuple[int, TranscriptLine]] = list(reader.iter_numbered())
+
+                with TranscriptReader(path, ReaderBackend.Mmap) as class_under_test:
+                    # Act
+                    actual: list[tuple[int, TranscriptLine]] = list(class_under_test.iter_numbered())
+
+                    # Assert
+                    self.assertListEqual(expected, actual)
+
+    def test_read_batches_yields_batches_of_batch_size(self):
+        # Arrange
+        path: str = TestTranscriptReader.__create_path('test-transcript.trans.txt')
+
+        with TranscriptReader(path) as class_under_test:
+            # Act
+            actual: list[int] = [len(batch) for batch in class_under_test.read_batches(3)]
+
+            # Assert
+            self.assertListEqual([3, 3, 2], actual)
+
     @classmethod
     def __create_path(cls, filename: str) -> str:
         return os.path.join(cls.resources_path, filename)
@@ -0,0 +1,58 @@
+﻿import unittest
+
+from src.kaldi_training_data_formatter import TranscriptLine, TranscriptTable
+
+
+class TestTranscriptTable(unittest.TestCase):
+    def setUp(self):
+        self.lines: list[TranscriptLine] = [
+            TranscriptLine.from_line('[0000] fire fire light the fire'),
+            TranscriptLine.from_line('[0001]'),
+            TranscriptLine.from_line('[0002] start the fire'),
+        ]
+
+    def test_iter_yields_equal_lines(self):
+        # Arrange
+        class_under_test: TranscriptTable = TranscriptTable(self.lines)
+
+        # Act
+        actual: list[TranscriptLine] = list(class_under_test)
+
+        # Assert
+        self.assertListEqual(self.lines, actual)
+
+    def test_getitem_given_negative_index_returns_line_from_end(self):
+        # Arrange
+        class_under_test: TranscriptTable = TranscriptTable(self.lines)
+
+        # Act
+        actual: TranscriptLine = class_under_test[-1]
+
+        # Assert
+        self.assertEqual(self.lines[-1], actual)
+
+    def test_append_shares_words_between_lines(self):
+        # Act
+        class_under_test: TranscriptTable = TranscriptTable(self.lines)
+
+        # Assert
+        with self.subTest():
+            self.assertListEqual(['fire', 'light', 'the', 'start'], class_under_test.words)
+        with self.subTest():
+            self.assertEqual(8, class_under_test.token_count)
+
+    def test_eq_returns_expected(self):
+        # Arrange
+        class_under_test: TranscriptTable = TranscriptTable(self.lines)
+
+        # Assert
+        with self.subTest():
+            self.assertTrue(class_under_test == TranscriptTable(self.lines))
+        with self.subTest():
+            self.assertFalse(class_under_test == TranscriptTable(self.lines[:2]))
+        with self.subTest():
+            self.assertFalse(class_under_test == None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
-﻿import os
+﻿import lzma
+import os
+import tempfile
 import unittest
 
 from src.kaldi_training_data_formatter import VocabCompiler
+from tests.case.corpus_builder import CorpusBuilder
 from tests.case.file_test_case import FileTestCase
 
 
@@ -80,6 +83,84 @@ class TestVocabCompiler(FileTestCase):
                              open(actual_path, mode='r', encoding='utf-8-sig'),
                              'Assert that vocab in actual file equals expected file')
 
+    def test_read_vocabulary_with_jobs_has_same_vocabulary_as_serial_run(self):
+        with tempfile.TemporaryDirectory() as root:
+            # Arrange
+            for project_num in range(8):
+                CorpusBuilder.create_transcript(root,
+                                                'user',
+                                                f'project-{project_num}',
+                                                'chapter',
+                                                f'0000 Hello world {project_num}\n0001 word-{project_num}\n')
+
+            serial: VocabCompiler = VocabCompiler.from_root(root)
+            class_under_test: VocabCompiler = VocabCompiler.from_root(root, jobs=2)
+            serial.read_vocabulary()
+
+            # Act
+            class_under_test.read_vocabulary()
+
+            # Assert
+            self.assertSetEqual(serial.vocabulary, class_under_test.vocabulary)
+
+    def test_read_vocabulary_with_cache_reflects_changed_and_removed_transcripts(self):
+        with tempfile.TemporaryDirectory() as root:
+            # Arrange
+            CorpusBuilder.create_transcript(root, 'user', 'project-1', 'chapter', '0000 kept words\n')
+            changed_path: str = CorpusBuilder.create_transcript(root, 'user', 'project-2', 'chapter', '0000 old\n')
+            removed_path: str = CorpusBuilder.create_transcript(root, 'user', 'project-3', 'chapter', '0000 removed\n')
+            VocabCompiler.from_root(root, use_cache=True).read_vocabulary()
+
+            with open(changed_path, mode='w', encoding='utf-8') as f:
+                f.write('0000 new text\n')
+
+            os.utime(changed_path, ns=(0, 0))
+            os.remove(removed_path)
+            os.rmdir(os.path.dirname(removed_path))
+            class_under_test: VocabCompiler = VocabCompiler.from_root(root, use_cache=True)
+
+            # Act
+            class_under_test.read_vocabulary()
+
+            # Assert
+            self.assertSetEqual({'kept', 'words', 'new', 'text'}, class_under_test.vocabulary)
+
+    def test_read_vocabulary_counts_transcripts_lines_and_bytes(self):
+        with tempfile.TemporaryDirectory() as root:
+            # Arrange
+            text: str = '0000 hello world\n0001 fire\n'
+            CorpusBuilder.create_transcript(root, 'user', 'project-1', 'chapter', text)
+            CorpusBuilder.create_transcript(root, 'user', 'project-2', 'chapter', text)
+            class_under_test: VocabCompiler = VocabCompiler.from_root(root)
+
+            # Act
+            class_under_test.read_vocabulary()
+
+            # Assert
+            with self.subTest():
+                self.assertEqual(2, class_under_test.transcripts_read)
+            with self.subTest():
+                self.assertEqual(4, class_under_test.lines_read)
+            with self.subTest():
+                self.assertEqual(2 * len(text.encode('utf-8')), class_under_test.bytes_read)
+
+    def test_read_vocabulary_reads_compressed_transcripts(self):
+        with tempfile.TemporaryDirectory() as root:
+            # Arrange
+            directory: str = os.path.join(root, 'user', 'project', 'chapter')
+            os.makedirs(directory)
+
+            with lzma.open(os.path.join(directory, 'chapter.trans.txt.xz'), mode='wt', encoding='utf-8') as f:
+                f.write('\ufeff0000 Hello World\n')
+
+            class_under_test: VocabCompiler = VocabCompiler.from_root(root)
+
+            # Act
+            class_under_test.read_vocabulary()
+
+            # Assert
+            self.assertSetEqual({'hello', 'world'}, class_under_test.vocabulary)
+
 
 if __name__ == '__main__':
     unittest.main()
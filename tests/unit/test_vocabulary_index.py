@@ -0,0 +1,65 @@
+﻿import unittest
+
+from src.kaldi_training_data_formatter import VocabularyIndex
+
+
+class TestVocabularyIndex(unittest.TestCase):
+    def setUp(self):
+        self.class_under_test: VocabularyIndex = VocabularyIndex()
+
+    def test_add_file_sums_counts_across_files(self):
+        # Act
+        self.class_under_test.add_file('a.trans.txt', {'fire': 2, 'light': 1})
+        self.class_under_test.add_file('b.trans.txt', {'fire': 1})
+
+        # Assert
+        self.assertDictEqual({'fire': 3, 'light': 1}, self.class_under_test.counts)
+
+    def test_add_file_when_file_already_added_raises_exception(self):
+        # Arrange
+        self.class_under_test.add_file('a.trans.txt', {'fire': 1})
+
+        # Assert
+        with self.assertRaises(Exception):
+            self.class_under_test.add_file('a.trans.txt', {'fire': 1})
+
+    def test_remove_file_only_removes_words_without_other_occurrences(self):
+        # Arrange
+        self.class_under_test.add_file('a.trans.txt', {'fire': 2, 'light': 1})
+        self.class_under_test.add_file('b.trans.txt', {'fire': 1})
+
+        # Act
+        self.class_under_test.remove_file('a.trans.txt')
+
+        # Assert
+        with self.subTest():
+            self.assertDictEqual({'fire': 1}, self.class_under_test.counts)
+        with self.subTest():
+            self.assertSetEqual({'fire'}, self.class_under_test.vocabulary)
+
+    def test_update_file_replaces_contribution_of_file(self):
+        # Arrange
+        self.class_under_test.add_file('a.trans.txt', {'fire': 2, 'light': 1})
+
+        # Act
+        self.class_under_test.update_file('a.trans.txt', {'fire': 1, 'start': 1})
+
+        # Assert
+        with self.subTest():
+            self.assertDictEqual({'fire': 1, 'start': 1}, self.class_under_test.counts)
+        with self.subTest():
+            self.assertSetEqual({'fire', 'start'}, self.class_under_test.vocabulary)
+
+    def test_get_frequent_words_returns_words_with_at_least_min_count(self):
+        # Arrange
+        self.class_under_test.add_file('a.trans.txt', {'fire': 2, 'light': 1})
+
+        # Act
+        actual: set[str] = self.class_under_test.get_frequent_words(2)
+
+        # Assert
+        self.assertSetEqual({'fire'}, actual)
+
+
+if __name__ == '__main__':
+    unittest.main()